@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+import asyncio
+
+# Make the server module importable when run from the repository root or from Misc/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import ModusFromMCP
+
+ITERATIONS = 50
+FORM_COMPONENTS = [
+    "ModusWcTextInput", "ModusWcSelect", "ModusWcButton", "ModusWcCheckbox",
+    "ModusWcTextarea", "ModusWcRadio", "ModusWcSwitch", "ModusWcDate",
+]
+
+
+async def call(name, arguments):
+    """Call a tool through the in-process FastMCP server and return the response size in bytes"""
+    contents = await ModusFromMCP.mcp.call_tool(name, arguments)
+    return sum(len(content.text.encode("utf-8")) for content in contents)
+
+
+async def sequential(names, fields):
+    total = 0
+    for component_name in names:
+        arguments = {"component_name": component_name}
+        if fields:
+            arguments["fields"] = fields
+        total += await call("get_component_details", arguments)
+    return total
+
+
+async def batched(names, fields):
+    arguments = {"names": names}
+    if fields:
+        arguments["fields"] = fields
+    return await call("get_components_details", arguments)
+
+
+async def measure(func, names, fields):
+    elapsed = 0.0
+    for _ in range(ITERATIONS):
+        # Every iteration builds its responses; otherwise all but the first are response cache hits
+        ModusFromMCP.response_cache.clear()
+        start = time.perf_counter()
+        size = await func(names, fields)
+        elapsed += time.perf_counter() - start
+    return size, elapsed / ITERATIONS * 1000
+
+
+async def main():
+    for fields in (None, ["properties", "events"]):
+        label = "all fields" if fields is None else ", ".join(fields)
+        print(f"\n{len(FORM_COMPONENTS)} components, {label}")
+        sequential_bytes, sequential_ms = await measure(sequential, FORM_COMPONENTS, fields)
+        batched_bytes, batched_ms = await measure(batched, FORM_COMPONENTS, fields)
+        print(f"  {len(FORM_COMPONENTS)} x get_component_details: {sequential_ms:8.2f} ms  {sequential_bytes:>10,} B"
+              f"  ({len(FORM_COMPONENTS)} round trips)")
+        print(f"  1 x get_components_details:  {batched_ms:8.2f} ms  {batched_bytes:>10,} B  (1 round trip)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
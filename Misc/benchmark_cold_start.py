@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+import time
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+CACHE_FILES = [os.path.join(ROOT, ".cache", name) for name in ("kb_snapshot.pickle", "search_index.pickle")]
+RUNS = 5
+
+# Runs in a fresh interpreter: import the server and answer one tool call, timing each phase
+CHILD = r"""
+import time, json, asyncio
+start = time.perf_counter()
+import ModusFromMCP
+imported = time.perf_counter()
+asyncio.run(ModusFromMCP.mcp.call_tool("get_component_details", {"component_name": "ModusWcButton"}))
+answered = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "first_call_ms": (answered - imported) * 1000,
+                  "load": ModusFromMCP.registry.get_reload_metrics()["initial_load_source"]}))
+"""
+
+
+def run_child():
+    """Start a new interpreter and return its phase timings plus total wall time to the first response"""
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD], cwd=SRC, capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def report(label, results):
+    mean = lambda key: sum(result[key] for result in results) / len(results)
+    print(f"{label:<28} first call {mean('first_call_ms'):8.1f} ms   import {mean('import_ms'):7.1f} ms"
+          f"   process start to response {mean('process_ms'):8.1f} ms   ({results[-1]['load']})")
+
+
+def main():
+    # Parsing from the source files: remove the compiled snapshot and search index before every run
+    results = []
+    for _ in range(RUNS):
+        for path in CACHE_FILES:
+            if os.path.exists(path):
+                os.remove(path)
+        results.append(run_child())
+    report("sources (no cache)", results)
+
+    # The previous run left a compiled snapshot behind
+    report("compiled snapshot", [run_child() for _ in range(RUNS)])
+
+
+if __name__ == "__main__":
+    main()
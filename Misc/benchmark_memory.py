@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+RUNS = 3
+
+# Runs in a fresh interpreter: load the Knowledge Base in one representation and report what it costs.
+# "compact" is the registry snapshot; "naive" keeps the same data as plain dicts, lists and copied strings.
+CHILD = r"""
+import gc, sys, json, tracemalloc
+
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * __import__("os").sysconf("SC_PAGE_SIZE")
+
+model, trace = sys.argv[1], sys.argv[2] == "trace"
+from modules.component_registry import ComponentRegistry
+registry = ComponentRegistry()
+registry.snapshot_path = "/nonexistent/kb_snapshot.pickle"
+registry.search_index_path = "/nonexistent/search_index.pickle"
+gc.collect()
+rss_before = rss()
+if trace:
+    tracemalloc.start()
+
+snapshot = registry._build_snapshot(None)
+if model == "naive":
+    with open(registry.components_path, encoding="utf-8") as f:
+        components = json.load(f)
+    kb_texts = {framework: buffer.decode("utf-8") for framework, buffer in snapshot.kb_contents.items()}
+    examples = {
+        framework: {
+            name: [dict(record.to_dict(("content", "question", "code", "code_blocks"))) for record in records]
+            for name, records in by_component.items()
+        }
+        for framework, by_component in snapshot.examples.items()
+    }
+    index = snapshot.search_index.postings
+    postings = {term: list(index.get(term)) for term in index.columns}
+    vectors = snapshot.example_vectors
+    columns = [list(zip(vectors.column_rows[start:end], vectors.column_weights[start:end]))
+               for start, end in zip(vectors.column_starts, vectors.column_starts[1:])]
+    trigrams = {trigram: list(positions) for trigram, positions in snapshot.icon_index.trigrams.items()}
+    data = (components, kb_texts, examples, postings, columns, trigrams, snapshot.search_index.documents,
+            snapshot.icon_index.sorted_names, snapshot.docs)
+    del snapshot, index, vectors
+else:
+    data = snapshot
+    del snapshot
+
+gc.collect()
+# tracemalloc's own bookkeeping inflates RSS, so the two numbers come from separate processes
+print(json.dumps(tracemalloc.get_traced_memory()[0] if trace else rss() - rss_before))
+"""
+
+
+def run_child(model, trace):
+    output = subprocess.run([sys.executable, "-c", CHILD, model, "trace" if trace else "rss"], cwd=SRC,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    print(f"Knowledge Base held in memory, mean of {RUNS} fresh processes\n")
+    results = {}
+    for model in ("naive", "compact"):
+        results[model] = {
+            key: sum(run_child(model, key == "allocated") for _ in range(RUNS)) / RUNS for key in ("allocated", "rss")
+        }
+        print(f"{model:<8} allocated {results[model]['allocated'] / 1024:8.0f} KB"
+              f"   RSS growth {results[model]['rss'] / 1024:8.0f} KB")
+    saved = 1 - results["compact"]["allocated"] / results["naive"]["allocated"]
+    print(f"\ncompact representation uses {saved:.0%} less memory per process")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import os
+import sys
+import json
+import time
+
+# Make src/modules importable when run from the repository root or from Misc/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from modules.component_registry import ComponentRegistry
+
+ITERATIONS = 200
+
+# (label, get_component_details keyword arguments)
+PROJECTIONS = [
+    ("full response", {}),
+    ("properties + events", {"fields": ["properties", "events"]}),
+    ("examples: code only", {"fields": ["examples"], "include": ["code"]}),
+    ("first example question", {"fields": ["examples"], "include": ["question"], "max_examples": 1}),
+]
+
+
+def measure(registry, component_name, options):
+    """Return (response bytes, mean build + serialization time in microseconds)"""
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        payload = json.dumps(registry.get_component_details(component_name, **options))
+    elapsed = (time.perf_counter() - start) / ITERATIONS * 1e6
+    return len(payload.encode("utf-8")), elapsed
+
+
+if __name__ == "__main__":
+    registry = ComponentRegistry()
+    components = [
+        name for name in registry.get_all_components()
+        if registry.get_component_details(name) is not None
+    ]
+
+    print(f"{'component':<24}" + "".join(f"{label:>28}" for label, _ in PROJECTIONS))
+    totals = [[0, 0.0] for _ in PROJECTIONS]
+    for component_name in components:
+        row = f"{component_name:<24}"
+        for i, (_, options) in enumerate(PROJECTIONS):
+            size, elapsed = measure(registry, component_name, options)
+            totals[i][0] += size
+            totals[i][1] += elapsed
+            row += f"{size:>14,} B {elapsed:>8.1f} us"
+        print(row)
+
+    print()
+    for (label, _), (size, elapsed) in zip(PROJECTIONS, totals):
+        print(f"{label:<24} mean {size / len(components):>10,.0f} B   {elapsed / len(components):>8.1f} us per component")
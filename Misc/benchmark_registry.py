@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import time
+
+# Make src/modules importable when run from the repository root or from Misc/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from modules.component_registry import ComponentRegistry
+
+ITERATIONS = 2000
+
+
+def legacy_get_component_properties_and_events(components_path, component_name):
+    """The pre-index implementation: re-open and json.load the file on every call"""
+    with open(components_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    component_data = data.get(component_name, {})
+    return {
+        "properties": component_data.get("properties", []),
+        "events": component_data.get("events", []),
+        "methods": component_data.get("methods", []),
+        "description": component_data.get("description", "")
+    }
+
+
+def legacy_get_all_components(components_path):
+    with open(components_path, 'r', encoding='utf-8') as f:
+        return list(json.load(f).keys())
+
+
+def legacy_get_icon_names_by_char(icons_path, char_prefix):
+    with open(icons_path, 'r', encoding='utf-8') as f:
+        icons = json.load(f).get("icons", [])
+    prefix = char_prefix.lower()
+    return [icon for icon in icons if icon.lower().startswith(prefix)]
+
+
+def legacy_get_component_examples(kb_path, component_name):
+    """The pre-index implementation: re-read the KB and scan it with find/split on every call"""
+    with open(kb_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    start_index = content.find(f"# {component_name}")
+    if start_index == -1:
+        return []
+    next_component_index = content.find("\n# ", start_index + 1)
+    if next_component_index == -1:
+        component_section = content[start_index:]
+    else:
+        component_section = content[start_index:next_component_index]
+    examples = []
+    for i, section in enumerate(component_section.split("## Prompt")[1:], 1):
+        code = ""
+        for marker in ["```tsx", "```jsx", "```typescript", "```javascript", "```"]:
+            code_start = section.find(marker)
+            if code_start != -1:
+                code_end = section.find("```", code_start + len(marker))
+                if code_end != -1:
+                    code = section[code_start + len(marker):code_end].strip()
+                    break
+        examples.append({"prompt_number": i, "content": f"## Prompt{section}", "code": code})
+    return examples
+
+
+def time_per_call(func, iterations=ITERATIONS):
+    """Return the mean latency of func() in microseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def report(label, before_us, after_us):
+    speedup = before_us / after_us if after_us else float("inf")
+    print(f"{label:<44} before: {before_us:10.2f} us   after: {after_us:8.2f} us   ({speedup:,.0f}x)")
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    registry = ComponentRegistry()
+    print(f"Registry startup (one-time parse): {(time.perf_counter() - start) * 1000:.2f} ms\n")
+
+    components_path = registry.components_path
+    icons_path = registry.icons_path
+    kb_path = registry.react_kb_path
+
+    report(
+        "get_component_properties_and_events",
+        time_per_call(lambda: legacy_get_component_properties_and_events(components_path, "ModusWcButton")),
+        time_per_call(lambda: registry.get_component_properties_and_events("ModusWcButton")),
+    )
+    report(
+        "get_all_components",
+        time_per_call(lambda: legacy_get_all_components(components_path)),
+        time_per_call(registry.get_all_components),
+    )
+    report(
+        "get_icon_names_by_char('a')",
+        time_per_call(lambda: legacy_get_icon_names_by_char(icons_path, "a")),
+        time_per_call(lambda: registry.get_icon_names_by_char("a")),
+    )
+    report(
+        "get_component_examples('ModusWcTypography')",
+        time_per_call(lambda: legacy_get_component_examples(kb_path, "ModusWcTypography")),
+        time_per_call(lambda: registry.get_component_examples("ModusWcTypography")),
+    )
+
+    print()
+    for query in ("accordion with icons and descriptions", "dropdown select options", "install icons cdn"):
+        latency = time_per_call(lambda: registry.search(query, k=10), iterations=500)
+        print(f"search({query!r}){'':<{max(0, 36 - len(query))}} {latency:8.2f} us")
@@ -0,0 +1,59 @@
+import os
+import sys
+import json
+import asyncio
+import logging
+
+# Make src/ importable when run from the repository root or from Misc/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+import ModusFromMCP
+
+SESSIONS = 3
+
+# One agent task: it re-reads the guidelines and the details of the components it is working with
+TASK = [
+    ("getting_started_guidelines", {}),
+    ("get_list_of_all_modus_components", {}),
+    ("get_component_details", {"component_name": "ModusWcTextInput"}),
+    ("get_component_details", {"component_name": "ModusWcButton"}),
+    ("search_modus", {"query": "dropdown select options"}),
+    ("get_component_details", {"component_name": "ModusWcSelect", "fields": ["properties", "events"]}),
+]
+
+
+async def run_session(tasks):
+    """One MCP session running the agent task `tasks` times, e.g. once per user request"""
+    received = 0
+    async with create_connected_server_and_client_session(ModusFromMCP.mcp._mcp_server) as session:
+        for _ in range(tasks):
+            for name, arguments in TASK:
+                result = await session.call_tool(name, arguments)
+                received += len(result.content[0].text.encode("utf-8"))
+    return received
+
+
+async def main():
+    print(f"{'tasks per session':<20}{'bytes received':>16}{'without deltas':>16}{'saved':>8}")
+    for tasks in (1, 5, 20):
+        before = ModusFromMCP.session_deliveries.snapshot()
+        received = 0
+        for _ in range(SESSIONS):
+            received += await run_session(tasks)
+        after = ModusFromMCP.session_deliveries.snapshot()
+        full = after["bytes_full"] - before["bytes_full"]
+        sent = after["bytes_sent"] - before["bytes_sent"]
+        print(f"{tasks:<20}{received // SESSIONS:>16,}{(received - sent + full) // SESSIONS:>16,}"
+              f"{1 - sent / full:>8.0%}")
+
+    print("\nserver_stats session_deliveries totals:")
+    totals = ModusFromMCP.session_deliveries.snapshot()
+    del totals["sessions"]
+    print(json.dumps(totals, indent=2))
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    asyncio.run(main())
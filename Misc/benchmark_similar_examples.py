@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+
+# Make src/modules importable when run from the repository root or from Misc/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from modules import example_vectors
+from modules.component_registry import ComponentRegistry
+from modules.example_vectors import ExampleVectorIndex
+
+ITERATIONS = 200
+QUERIES = [
+    "accordion with icons and descriptions",
+    "dropdown to pick one option from a list",
+    "show a confirmation dialog before deleting",
+    "form with validation errors under the text field",
+    "table with pagination and row selection",
+    "toast notification that disappears after a few seconds",
+    "date picker with min and max date",
+    "navbar with user avatar and search",
+]
+
+
+def per_query_us(func, query_count):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func()
+    return (time.perf_counter() - start) / ITERATIONS / query_count * 1e6
+
+
+def measure(label, index):
+    single = per_query_us(lambda: index.search([QUERIES[0]], 5), 1)
+    batched = per_query_us(lambda: index.search(QUERIES, 5), len(QUERIES))
+    print(f"{label:<30} single query {single:8.1f} us   batch of {len(QUERIES)} {batched:8.1f} us/query")
+
+
+def replicated(examples_by_framework, copies):
+    """The knowledge base examples repeated `copies` times, to see how each path scales"""
+    return {
+        framework: {f"{name}#{copy}": records for copy in range(copies) for name, records in examples.items()}
+        for framework, examples in examples_by_framework.items()
+    }
+
+
+def compare(label, examples_by_framework):
+    threshold = example_vectors.NUMPY_MIN_EXAMPLES
+    if example_vectors._numpy() is not None:
+        # Force the NumPy path regardless of index size
+        example_vectors.NUMPY_MIN_EXAMPLES = 0
+        try:
+            measure(f"{label}, NumPy", ExampleVectorIndex(examples_by_framework))
+        finally:
+            example_vectors.NUMPY_MIN_EXAMPLES = threshold
+    # The pure-Python path, as used for small indexes or when NumPy is not installed
+    # np = False is how a missing NumPy is recorded
+    numpy_module, example_vectors.np = example_vectors.np, False
+    try:
+        measure(f"{label}, pure Python", ExampleVectorIndex(examples_by_framework))
+    finally:
+        example_vectors.np = numpy_module
+
+
+def main():
+    snapshot = ComponentRegistry().snapshot()
+    index = snapshot.example_vectors
+    print(f"{len(index)} examples, {len(index.vocabulary)} features\n")
+
+    for query, matches in zip(QUERIES, index.search(QUERIES, 3)):
+        print(f"{query}")
+        for score, framework, example in matches:
+            print(f"  {score:.3f}  {example.component} #{example.prompt_number} ({framework}): {example.question[:70]}")
+    print()
+
+    compare(f"{len(index)} examples", snapshot.examples)
+    compare(f"{len(index) * 100} examples", replicated(snapshot.examples, 100))
+
+
+if __name__ == "__main__":
+    main()
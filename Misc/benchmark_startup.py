@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import socket
+import asyncio
+import subprocess
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+CLI = os.path.join(SRC, "modus_mcp.py")
+RUNS = 5
+SSE_PORT = 3011
+FIRST_CALL = ("get_component_details", {"component_name": "ModusWcButton"})
+
+
+def import_breakdown(top=12):
+    """Cumulative `python -X importtime` cost of importing the server, grouped by top-level package"""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import ModusFromMCP"], cwd=SRC,
+                            capture_output=True, text=True, check=True).stderr
+    totals = {}
+    for line in stderr.splitlines():
+        # "import time:  <self us> | <cumulative us> | <module>"
+        parts = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        package = parts[2].strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(parts[0])
+    print("Import time by top-level package (self time summed, ms):")
+    for package, micros in sorted(totals.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:<24} {micros / 1000:8.1f}")
+    print(f"  {'total':<24} {sum(totals.values()) / 1000:8.1f}")
+
+
+async def stdio_first_response():
+    """Spawn the server on stdio and return (ms to initialized, ms to first tool response)"""
+    start = time.perf_counter()
+    params = StdioServerParameters(command=sys.executable, args=[CLI, "--transport", "stdio", "--no-watch",
+                                                                 "--log-level", "WARNING"], cwd=SRC)
+    async with stdio_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            initialized = time.perf_counter()
+            await session.call_tool(*FIRST_CALL)
+            answered = time.perf_counter()
+    return (initialized - start) * 1000, (answered - start) * 1000
+
+
+async def sse_first_response():
+    """Spawn the server on SSE and return (ms to initialized, ms to first tool response)"""
+    start = time.perf_counter()
+    server = subprocess.Popen([sys.executable, CLI, "--transport", "sse", "--port", str(SSE_PORT), "--no-watch",
+                               "--log-level", "WARNING"], cwd=SRC, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                socket.create_connection(("localhost", SSE_PORT), timeout=1).close()
+                break
+            except OSError:
+                await asyncio.sleep(0.01)
+        async with sse_client(f"http://localhost:{SSE_PORT}/sse") as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                initialized = time.perf_counter()
+                await session.call_tool(*FIRST_CALL)
+                answered = time.perf_counter()
+        return (initialized - start) * 1000, (answered - start) * 1000
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+
+def report(label, results):
+    initialized = sum(result[0] for result in results) / len(results)
+    answered = sum(result[1] for result in results) / len(results)
+    print(f"  {label:<6} process start to initialized {initialized:8.1f} ms   to first tool response {answered:8.1f} ms")
+
+
+def main():
+    import_breakdown()
+    print(f"\nWall clock, mean of {RUNS} runs:")
+    report("stdio", [asyncio.run(stdio_first_response()) for _ in range(RUNS)])
+    report("sse", [asyncio.run(sse_first_response()) for _ in range(RUNS)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+import multiprocessing
+from urllib.parse import urlparse
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+SERVER_CLI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "modus_mcp.py")
+
+# A representative agent workload: (tool name, arguments). Each session repeats it, so every call
+# passes force_full: otherwise the repeats are answered with small already_sent references
+WORKLOAD = [
+    ("get_component_details", {"component_name": "ModusWcButton", "force_full": True}),
+    ("get_component_details", {"component_name": "ModusWcSelect", "fields": ["properties", "events"],
+                               "force_full": True}),
+    ("get_modus_icons_by_char", {"char_prefix": "ar", "force_full": True}),
+    ("search_modus", {"query": "dropdown select options", "force_full": True}),
+    ("get_list_of_all_modus_components", {"force_full": True}),
+    ("getting_started_guidelines", {"force_full": True}),
+]
+
+
+async def run_session(url, calls, latencies, errors):
+    """One MCP client session issuing `calls` tool calls back to back"""
+    async with sse_client(url) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            for i in range(calls):
+                name, arguments = WORKLOAD[i % len(WORKLOAD)]
+                start = time.perf_counter()
+                result = await session.call_tool(name, arguments)
+                latencies.append(time.perf_counter() - start)
+                if result.isError:
+                    errors.append(name)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def run_sessions(url, sessions, calls):
+    latencies = []
+    errors = []
+    await asyncio.gather(*(run_session(url, calls, latencies, errors) for _ in range(sessions)))
+    return latencies, errors
+
+
+def client_process(url, sessions, calls):
+    """Entry point of one load-generating process"""
+    return asyncio.run(run_sessions(url, sessions, calls))
+
+
+def load_test(url, sessions, calls, client_processes):
+    """Run `sessions` concurrent sessions spread over `client_processes` processes
+
+    A single Python client process saturates long before a multi-worker server does,
+    so the load is generated from several processes.
+    """
+    shares = [sessions // client_processes + (1 if i < sessions % client_processes else 0)
+              for i in range(client_processes)]
+    start = time.perf_counter()
+    if client_processes == 1:
+        results = [client_process(url, sessions, calls)]
+    else:
+        with multiprocessing.Pool(client_processes) as pool:
+            results = pool.starmap(client_process, [(url, share, calls) for share in shares if share])
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    errors = [error for result in results for error in result[1]]
+    print(f"{sessions} sessions x {calls} calls = {len(latencies)} requests in {elapsed:.2f} s")
+    print(f"  throughput: {len(latencies) / elapsed:8.1f} req/s")
+    print(f"  p50:        {percentile(latencies, 0.50) * 1000:8.2f} ms")
+    print(f"  p99:        {percentile(latencies, 0.99) * 1000:8.2f} ms")
+    if errors:
+        print(f"  errors:     {len(errors)}")
+    return len(latencies) / elapsed
+
+
+def server_memory_kb(pid):
+    """Proportional set size (shared pages split between sharers) of a process and its children, on Linux"""
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(child) for child in f.read().split()]
+        total = 0
+        for process_id in pids:
+            with open(f"/proc/{process_id}/smaps_rollup") as f:
+                total += next(int(line.split()[1]) for line in f if line.startswith("Pss:"))
+        return total, len(pids)
+    except (OSError, StopIteration):
+        return None, len(pids)
+
+
+def wait_for_server(url, timeout=30):
+    """Block until the server accepts TCP connections on the URL's port"""
+    parsed = urlparse(url)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((parsed.hostname, parsed.port or 80), timeout=1):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def stop_server(server):
+    server.terminate()
+    try:
+        server.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        # uvicorn waits for open SSE streams on SIGTERM; don't hang on them
+        server.kill()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the Modus MCP server")
+    parser.add_argument("--url", default="http://localhost:3001/sse", help="SSE endpoint of the server")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent client sessions")
+    parser.add_argument("--calls", type=int, default=50, help="Tool calls per session")
+    parser.add_argument("--client-processes", type=int, default=1, help="Processes generating the load")
+    parser.add_argument("--spawn", action="store_true", help="Start the server for the duration of the test")
+    parser.add_argument("--workers", default="1",
+                        help="With --spawn, comma-separated server worker counts to compare, e.g. 1,2,4")
+    args = parser.parse_args()
+
+    if not args.spawn:
+        wait_for_server(args.url)
+        load_test(args.url, args.sessions, args.calls, args.client_processes)
+        return
+
+    port = urlparse(args.url).port or 80
+    throughput = {}
+    for workers in [int(count) for count in args.workers.split(",")]:
+        print(f"\n--- {workers} worker(s) ---")
+        server = subprocess.Popen(
+            [sys.executable, SERVER_CLI, "--transport", "sse", "--port", str(port), "--workers", str(workers),
+             "--no-watch", "--log-level", "WARNING"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_for_server(args.url)
+            throughput[workers] = load_test(args.url, args.sessions, args.calls, args.client_processes)
+            memory, processes = server_memory_kb(server.pid)
+            if memory is not None:
+                print(f"  server PSS: {memory / 1024:8.1f} MB across {processes} process(es)")
+        finally:
+            stop_server(server)
+
+    if len(throughput) > 1:
+        baseline_workers = min(throughput)
+        print("\nScaling (throughput relative to the smallest worker count):")
+        for workers, value in sorted(throughput.items()):
+            print(f"  {workers:>3} worker(s): {value / throughput[baseline_workers]:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
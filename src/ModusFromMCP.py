@@ -1,8 +1,21 @@
 from mcp.server.fastmcp import FastMCP
+from mcp.server.lowlevel.server import request_ctx
 from modules.component_registry import ComponentRegistry
+from modules.kb_watcher import KnowledgeBaseWatcher
+from modules.metrics import metrics
+from modules.response_cache import ResponseCache
+from modules.session_deliveries import SessionDeliveries
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import os
 import json
+import asyncio
+import logging
+import threading
+import functools
+from urllib.parse import unquote
+
+logger = logging.getLogger("ModusFromMCP")
 
 # Instantiate MCP server
 mcp = FastMCP(
@@ -14,92 +27,185 @@ mcp = FastMCP(
     allow_origins=["*"]
 )
 
-# Initialize component registry
+# Initialize component registry; the Knowledge Base itself is loaded on the first tool call that needs it
 registry = ComponentRegistry()
 
+def current_session():
+    """The MCP session of the request being handled, or None outside of a request"""
+    context = request_ctx.get(None)
+    return context.session if context is not None else None
+
+# Which response versions each session already has, so repeated calls are answered with a reference or a delta
+session_deliveries = SessionDeliveries(current_session)
+
+# Serialized responses keyed by (handler, arguments, snapshot generation), with content-hash ETags
+response_cache = ResponseCache(lambda: registry.snapshot().generation, deliveries=session_deliveries)
+
+# Bounded pool for the handlers whose work (search scoring, multi-component payloads) is heavy
+# enough to keep off the event loop; cheap snapshot lookups run inline. Created on first use.
+tool_executor = None
+
+async def run_in_pool(func, *args, **kwargs):
+    """Run a blocking or CPU-heavy call on the tool thread pool without blocking other sessions"""
+    global tool_executor
+    if tool_executor is None:
+        tool_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="modus-tool")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(tool_executor, functools.partial(func, *args, **kwargs))
+
+def snapshot_loaded(func):
+    """Decorator for handlers that read the registry: if the Knowledge Base is not loaded yet, load it on the
+    tool pool first, so a call arriving before the startup warm-up finishes never parses it on the event loop"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if not registry.is_loaded():
+            await run_in_pool(registry.snapshot)
+        return await func(*args, **kwargs)
+    return wrapper
+
 # Tool 1: Return guidelines for getting started
 @mcp.tool()
-def getting_started_guidelines():
-    """Get guidelines for installation and usage of Modus components"""
+@metrics.instrument
+@snapshot_loaded
+@response_cache.cached
+async def getting_started_guidelines(if_none_match: str = None, force_full: bool = False):
+    """Get guidelines for installation and usage of Modus components.
+    if_none_match: the etag of a previous response; returns {"unchanged": true} if it is still current.
+    Repeating a call in the same session returns a reference to the response already sent (or only its
+    changed fields after a knowledge base update); pass force_full=true to get the whole response again."""
     try:
         guidelines = registry.get_installation_guidelines()
         return {"success": True, "guidelines": guidelines}
     except Exception as e:
-        print(f"Error in getting_started_installation_and_guidelines: {str(e)}")
+        logger.error("Error in getting_started_installation_and_guidelines: %s", e)
         return {"success": False, "error": str(e)}
 
 # Tool 2: List all Modus components
 @mcp.tool()
-def get_list_of_all_modus_components():
-    """Get a list of all available Modus components (both form and UI)"""
+@metrics.instrument
+@snapshot_loaded
+@response_cache.cached
+async def get_list_of_all_modus_components(if_none_match: str = None, force_full: bool = False):
+    """Get a list of all available Modus components (both form and UI).
+    if_none_match: the etag of a previous response; returns {"unchanged": true} if it is still current.
+    Repeating a call in the same session returns a reference to the response already sent (or only its
+    changed fields after a knowledge base update); pass force_full=true to get the whole response again."""
     try:
         components = registry.get_all_components()
         return {"success": True, "components": components}
     except Exception as e:
-        print(f"Error in get_list_of_all_modus_components: {str(e)}")
+        logger.error("Error in get_list_of_all_modus_components: %s", e)
         return {"success": False, "error": str(e)}
 
 # Tool 3: Get details for a specific component
 @mcp.tool()
-def get_component_details(component_name: str, framework: str = None):
-    """Get properties and usage examples for a specific Modus component"""
+@metrics.instrument
+@snapshot_loaded
+@response_cache.cached
+async def get_component_details(component_name: str, framework: str = None, fields: list[str] = None,
+                                max_examples: int = None, offset: int = 0, include: list[str] = None,
+                                if_none_match: str = None, force_full: bool = False):
+    """Get properties and usage examples for a specific Modus component.
+    framework: 'react' (default) or 'angular'; examples_fallback is true when no examples exist for it.
+    Optional: fields (subset of description, properties, events, methods, examples),
+    include (example text fields: code, content, question; code_blocks lists every fenced snippet of a
+    prompt with its language and line range), and max_examples/offset to page examples.
+    if_none_match: the etag of a previous response; returns {"unchanged": true} if it is still current.
+    Repeating a call in the same session returns a reference to the response already sent (or only its
+    changed fields after a knowledge base update); pass force_full=true to get the whole response again."""
     try:
-        print(f"Fetching details for component: {component_name} (Framework: {framework or 'React'})")
+        logger.debug("Fetching details for component: %s (Framework: %s)", component_name, framework or "React")
         
-        # Get component properties from registry
-        component_info = registry.get_component_properties_and_events(component_name)
+        # Resolve everything against one snapshot so a concurrent hot-reload cannot mix versions
+        details = registry.get_component_details(
+            component_name, framework=framework, fields=fields, include=include, max_examples=max_examples,
+            offset=offset, snapshot=registry.snapshot()
+        )
         
-        if not component_info["properties"]:
+        if details is None:
             error_msg = f"Component {component_name} not found in component registry"
-            print(error_msg)
+            logger.debug(error_msg)
             return {"success": False, "error": error_msg}
         
-        # Get examples using the registry method with framework-specific examples
-        kb = get_knowledge_base()
-        examples = []
-        if kb and kb["content"]:
-            if framework and framework.lower() == "angular":
-                # Extract Angular-specific examples
-                examples = registry._extract_kb_examples(kb["content"], component_name, framework="angular")
-            else:
-                # Default to React examples
-                examples = registry._extract_kb_examples(kb["content"], component_name)
-        
         result = {
             "success": True,
             "component": component_name,
-            "description": component_info["description"],
-            "properties": component_info["properties"],
-            "events": component_info["events"],
-            "methods": component_info["methods"],
-            "examples": examples,
+            **details,
             "framework": framework or "React"
         }
         
-        print(f"Successfully fetched details for {component_name} ({framework or 'React'})")
+        logger.debug("Successfully fetched details for %s (%s)", component_name, framework or "React")
         return result
     except Exception as e:
-        print(f"Error in get_component_details: {str(e)}")
+        logger.error("Error in get_component_details: %s", e)
+        return {"success": False, "error": str(e)}
+
+# Tool 3b: Get details for many components in one call
+@mcp.tool()
+@metrics.instrument
+@snapshot_loaded
+@response_cache.cached
+async def get_components_details(names: list[str], framework: str = None, fields: list[str] = None,
+                                 include: list[str] = None, max_examples: int = None, if_none_match: str = None,
+                                 force_full: bool = False):
+    """Get properties and usage examples for several Modus components in one call (e.g. all the
+    components of a form). Definitions shared verbatim by several components (like customClass)
+    are returned once in shared_properties / shared_events. Unknown names are listed in unknown.
+    if_none_match: the etag of a previous response; returns {"unchanged": true} if it is still current.
+    Repeating a call in the same session returns a reference to the response already sent (or only its
+    changed fields after a knowledge base update); pass force_full=true to get the whole response again."""
+    try:
+        result = await run_in_pool(
+            registry.get_components_details, names, framework=framework, fields=fields, include=include,
+            max_examples=max_examples
+        )
+        return {"success": True, **result, "framework": framework or "React"}
+    except Exception as e:
+        logger.error("Error in get_components_details: %s", e)
+        return {"success": False, "error": str(e)}
+
+# Tool 3c: Components related to a component
+@mcp.tool()
+@metrics.instrument
+@snapshot_loaded
+@response_cache.cached
+async def get_related_components(component_name: str, depth: int = 1, relations: list[str] = None,
+                                 fields: list[str] = None, framework: str = None, max_examples: int = 0,
+                                 if_none_match: str = None, force_full: bool = False):
+    """Get the components a Modus component renders or is used with, e.g. ModusWcAccordion -> ModusWcCollapse.
+    relations to follow: 'uses' (declared child components), 'used_by' (parents) and 'used_with' (used
+    together in the examples); default uses and used_with. depth follows that many edges.
+    Pass fields (e.g. ['properties', 'events']) to also get the details of every related component.
+    if_none_match: the etag of a previous response; returns {"unchanged": true} if it is still current.
+    Repeating a call in the same session returns a reference to the response already sent (or only its
+    changed fields after a knowledge base update); pass force_full=true to get the whole response again."""
+    try:
+        arguments = dict(depth=depth, relations=relations, fields=fields, framework=framework,
+                         max_examples=max_examples)
+        if fields:
+            # Details of every related component are a multi-component payload; build them off the event loop
+            result = await run_in_pool(registry.get_related_components, component_name, **arguments)
+        else:
+            result = registry.get_related_components(component_name, **arguments)
+        if result is None:
+            return {"success": False, "error": f"Component {component_name} not found in component registry"}
+        return {"success": True, "component": component_name, "depth": depth, **result}
+    except Exception as e:
+        logger.error("Error in get_related_components: %s", e)
         return {"success": False, "error": str(e)}
 
 # Add knowledge base as a resource
 @mcp.resource(name="modus_kb", uri="http://localhost:3001/resources/modus_kb")
-def get_knowledge_base():
+@metrics.instrument
+@snapshot_loaded
+@response_cache.cached
+async def get_knowledge_base():
     """Knowledge base for Modus components with examples and best practices"""
     try:
-        # Only use the single knowledge base file
-        kb_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
-                            "Knowledge Base", "modus2_react_KB.md")
-        
-        # Read the knowledge base content
-        content = ""
-        
-        # Read knowledge base content
-        if os.path.exists(kb_path):
-            with open(kb_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        else:
-            print(f"Warning: Knowledge base file not found at {kb_path}")
+        # The registry reads the knowledge base once at startup
+        content = registry.get_knowledge_base_content()
+        if not content:
+            logger.warning("Knowledge base file not found at %s", registry.react_kb_path)
         
         return {
             "content": content,
@@ -107,45 +213,240 @@ def get_knowledge_base():
             "description": "Knowledge base for Modus components including examples"
         }
     except Exception as e:
-        print(f"Error loading knowledge base: {e}")
+        logger.error("Error loading knowledge base: %s", e)
         return None
 
+# Conditional fetch of the knowledge base: returns a small "unchanged" reply if known_etag is current
+@mcp.resource(name="modus_kb_if_changed", uri="http://localhost:3001/resources/modus_kb/{known_etag}")
+async def get_knowledge_base_if_changed(known_etag: str):
+    """Knowledge base for Modus components, or an 'unchanged' marker if known_etag matches the current version"""
+    return await get_knowledge_base(if_none_match=known_etag)
+
 # Tool 4: Get icons by character prefix
 @mcp.tool()
-def get_modus_icons_by_char(char_prefix: str = ""):
-    """Get Modus icon names that start with the specified character prefix"""
+@metrics.instrument
+@snapshot_loaded
+@response_cache.cached
+async def get_modus_icons_by_char(char_prefix: str = "", limit: int = 50, contains: str = "",
+                                  if_none_match: str = None, force_full: bool = False):
+    """Get Modus icon names that start with the specified character prefix.
+    Optional: contains (match icon names containing this text instead) and limit (maximum names returned,
+    default 50; pass null for all). total_matches reports how many names matched before the limit.
+    To check whether one icon name exists, use resolve_modus_icon instead.
+    if_none_match: the etag of a previous response; returns {"unchanged": true} if it is still current.
+    Repeating a call in the same session returns a reference to the response already sent (or only its
+    changed fields after a knowledge base update); pass force_full=true to get the whole response again."""
     try:
-        if char_prefix:
-            icons = registry.get_icon_names_by_char(char_prefix)
+        # Resolve everything against one snapshot so a concurrent hot-reload cannot mix versions
+        snapshot = registry.snapshot()
+        if contains:
+            icons = registry.get_icon_names_containing(contains, limit, snapshot=snapshot)
+            return {
+                "success": True,
+                "contains": contains,
+                "icon_count": len(icons),
+                "total_matches": snapshot.icon_index.count_substring(contains),
+                "icons": icons
+            }
+        elif char_prefix:
+            icons = registry.get_icon_names_by_char(char_prefix, limit, snapshot=snapshot)
             return {
                 "success": True, 
                 "char_prefix": char_prefix,
                 "icon_count": len(icons),
+                "total_matches": snapshot.icon_index.count_prefix(char_prefix),
                 "icons": icons
             }
         else:
             # If no prefix is provided, return all icons
-            icons = registry.get_all_icon_names()
+            icons = registry.get_all_icon_names(limit, snapshot=snapshot)
             return {
                 "success": True, 
                 "message": "Returning all icons (no prefix specified)",
                 "icon_count": len(icons),
+                "total_matches": len(snapshot.icon_index),
                 "icons": icons
             }
     except Exception as e:
-        print(f"Error in get_modus_icons_by_char: {str(e)}")
+        logger.error("Error in get_modus_icons_by_char: %s", e)
+        return {"success": False, "error": str(e)}
+
+# Tool 5: Validate a single icon name
+@mcp.tool()
+@metrics.instrument
+@snapshot_loaded
+async def resolve_modus_icon(name: str):
+    """Check whether a Modus icon name exists. Returns the canonical name, or 'did you mean' suggestions."""
+    try:
+        return {"success": True, "name": name, **registry.resolve_icon(name)}
+    except Exception as e:
+        logger.error("Error in resolve_modus_icon: %s", e)
+        return {"success": False, "error": str(e)}
+
+# Tool 5a: Check generated markup against the component schemas
+@mcp.tool()
+@metrics.instrument
+@snapshot_loaded
+async def validate_modus_snippet(code: str, framework: str = None):
+    """Check generated Modus code before returning it: every <ModusWc*> / <modus-wc-*> tag is checked for
+    unknown components, properties and events, invalid enum values (e.g. variant) and invalid icon names.
+    framework: 'react', 'angular' or 'html' (default: inferred per tag). All problems are returned at
+    once, with line, column and suggestions, so they can be fixed without further lookups."""
+    try:
+        return {"success": True, **await run_in_pool(registry.validate_snippet, code, framework)}
+    except Exception as e:
+        logger.error("Error in validate_modus_snippet: %s", e)
+        return {"success": False, "error": str(e)}
+
+# Tool 6: Ranked search across components, examples and documentation
+@mcp.tool()
+@metrics.instrument
+@snapshot_loaded
+@response_cache.cached
+async def search_modus(query: str, k: int = 10, kind: str = None, if_none_match: str = None,
+                       force_full: bool = False):
+    """Search Modus components, knowledge base examples and documentation for a free-text query.
+    Use this to find which component to use for a task. kind can be 'component', 'example' or 'doc'.
+    if_none_match: the etag of a previous response; returns {"unchanged": true} if it is still current.
+    Repeating a call in the same session returns a reference to the response already sent (or only its
+    changed fields after a knowledge base update); pass force_full=true to get the whole response again."""
+    try:
+        hits = await run_in_pool(registry.search, query, k=k, kind=kind)
+        return {"success": True, "query": query, "hit_count": len(hits), "hits": hits}
+    except Exception as e:
+        logger.error("Error in search_modus: %s", e)
         return {"success": False, "error": str(e)}
 
+# Tool 6a: Nearest knowledge base examples for a natural-language request
+@mcp.tool()
+@metrics.instrument
+@snapshot_loaded
+@response_cache.cached
+async def find_similar_examples(query: str, k: int = 5, framework: str = None, include: list[str] = None,
+                                if_none_match: str = None, force_full: bool = False):
+    """Find the knowledge base examples whose user question is closest to a natural-language request,
+    across all components (e.g. 'accordion with icons and descriptions'). framework: 'react' or 'angular'
+    (default: both). include: example text fields to return (question, code, content; default question);
+    use get_component_details with the returned component and prompt_number for the full example.
+    if_none_match: the etag of a previous response; returns {"unchanged": true} if it is still current.
+    Repeating a call in the same session returns a reference to the response already sent (or only its
+    changed fields after a knowledge base update); pass force_full=true to get the whole response again."""
+    try:
+        matches = await run_in_pool(
+            registry.find_similar_examples, query, k=k, framework=framework, include=include or ("question",)
+        )
+        return {"success": True, "query": query, "match_count": len(matches), "matches": matches}
+    except Exception as e:
+        logger.error("Error in find_similar_examples: %s", e)
+        return {"success": False, "error": str(e)}
+
+# Tool 6b: One section of the long-form documentation
+@mcp.tool()
+@metrics.instrument
+async def get_doc_section(path: str = "", heading: str = "", offset: int = 0, max_bytes: int = 16384):
+    """Get one section of the Modus documentation (combined_modus2.md, Modus2_guidelines.md, guidelines/*.md)
+    instead of the whole file. Without path, lists the documents; without heading, returns the document's
+    heading outline. heading can be a title, an anchor, or a path like 'modus-wc-button > Properties'.
+    Large sections are returned in chunks: pass next_offset as offset while has_more is true."""
+    try:
+        # Reads the document file (mmap), so it runs on the tool pool
+        section = await run_in_pool(registry.get_doc_section, path, heading, offset=offset, max_bytes=max_bytes)
+        return {"success": True, **section}
+    except Exception as e:
+        logger.error("Error in get_doc_section: %s", e)
+        return {"success": False, "error": str(e)}
+
+# The same sections as a resource, e.g. .../resources/docs/combined_modus2.md/modus-wc-button%20%3E%20Events
+@mcp.resource(name="modus_doc_section", uri="http://localhost:3001/resources/docs/{path}/{heading}")
+async def get_doc_section_resource(path: str, heading: str):
+    """One section (first chunk) of a Modus documentation file, addressed by file name and heading"""
+    return await get_doc_section(path=unquote(path), heading=unquote(heading))
+
+# Tool 7: Knowledge base reload status
+@mcp.tool()
+@metrics.instrument
+@snapshot_loaded
+async def get_knowledge_base_status():
+    """Get the current knowledge base snapshot generation and hot-reload timings"""
+    try:
+        return {"success": True, **registry.get_reload_metrics()}
+    except Exception as e:
+        logger.error("Error in get_knowledge_base_status: %s", e)
+        return {"success": False, "error": str(e)}
+
+# Tool 8: Server metrics
+@mcp.tool()
+@snapshot_loaded
+async def server_stats(format: str = "json"):
+    """Get per-tool call counts, latency histograms, payload sizes, cache hit ratios, bytes saved per session
+    by repeat-call references and deltas, and knowledge base reload metrics.
+    format: 'json' (default) or 'prometheus' for the Prometheus text exposition format."""
+    try:
+        if format == "prometheus":
+            return metrics.to_prometheus() + session_deliveries.to_prometheus()
+        return {"success": True, **metrics.snapshot(), "session_deliveries": session_deliveries.snapshot(),
+                "knowledge_base": registry.get_reload_metrics()}
+    except Exception as e:
+        logger.error("Error in server_stats: %s", e)
+        return {"success": False, "error": str(e)}
+
+def _build_worker_app(worker_id, watch=True):
+    """The SSE app of one worker process in multi-worker mode"""
+    from modules.multiworker import worker_message_path
+    
+    # Sessions are told to post to this worker's own endpoint, so their messages can be routed back to it
+    mcp.settings.message_path = worker_message_path(worker_id)
+    if watch:
+        KnowledgeBaseWatcher(registry).start()
+    return mcp.sse_app()
+
+def serve(transport="sse", host=None, port=None, watch=True, workers=1):
+    """Run the server until it is stopped
+    
+    Args:
+        transport: "sse" (HTTP server, the default) or "stdio" (one client on stdin/stdout)
+        host: SSE bind address; defaults to FastMCP's
+        port: SSE port; defaults to 3001
+        watch: Hot-reload Knowledge Base edits
+        workers: Number of SSE worker processes sharing the listening socket; 0 for one per CPU
+    """
+    workers = workers or os.cpu_count() or 1
+    if host:
+        mcp.settings.host = host
+    if port:
+        mcp.settings.port = port
+    if transport == "sse":
+        logger.info("Starting Modus Components MCP Server on http://localhost:%d", mcp.settings.port)
+    else:
+        logger.info("Starting Modus Components MCP Server on stdio")
+    logger.info("Available tools: getting_started_guidelines, get_list_of_all_modus_components, "
+                "get_component_details (optional parameter: framework='angular'), get_components_details, "
+                "get_related_components, get_modus_icons_by_char, resolve_modus_icon, validate_modus_snippet, "
+                "search_modus, find_similar_examples, get_doc_section, get_knowledge_base_status, server_stats")
+    if transport == "sse" and workers > 1:
+        from modules.multiworker import serve_workers
+        
+        # Load the snapshot before forking so every worker shares it instead of parsing its own copy
+        registry.snapshot()
+        serve_workers(functools.partial(_build_worker_app, watch=watch), mcp.settings.host, mcp.settings.port,
+                      workers, log_level=mcp.settings.log_level.lower())
+        return
+    # Load the Knowledge Base in the background while the server starts, so neither startup nor the
+    # first tool call waits for it
+    threading.Thread(target=registry.snapshot, name="kb-warmup", daemon=True).start()
+    if watch:
+        # Pick up edits to the Knowledge Base files without restarting the server
+        KnowledgeBaseWatcher(registry).start()
+    mcp.run(transport=transport)
+
 # Start the server when this module is run directly
 if __name__ == "__main__":
-    print("Starting Modus Components MCP Server on http://localhost:3001")
-    print("Available tools:")
-    print("- getting_started_installation_and_guidelines")
-    print("- get_list_of_all_modus_components")
-    print("- get_component_details (optional parameter: framework='angular')")
-    print("- get_modus_icons_by_char")
+    from modus_mcp import build_parser, configure_logging
+    
+    args = build_parser().parse_args()
+    configure_logging(args.log_level)
     try:
-        mcp.run(transport="sse")
+        serve(args.transport, host=args.host, port=args.port, watch=not args.no_watch, workers=args.workers)
     except Exception as e:
-        print(f"Error starting server: {e}")
-        sys.exit(1)
\ No newline at end of file
+        logger.error("Error starting server: %s", e)
+        sys.exit(1)
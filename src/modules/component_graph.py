@@ -0,0 +1,113 @@
+import re
+from collections import deque
+
+# Component references in example code: React/Angular identifiers and custom element tags
+_COMPONENT_REFERENCE_PATTERN = re.compile(r'\bModusWc[A-Za-z]+|\bmodus-wc-[a-z]+(?:-[a-z]+)*')
+
+# Edge types, in the order they are listed in responses
+RELATIONS = ("uses", "used_by", "used_with")
+
+# Relations followed when walking the graph, unless the caller picks others
+DEFAULT_RELATIONS = ("uses", "used_with")
+
+
+def component_tag(name):
+    """Custom element tag for a component name, e.g. ModusWcTextInput -> modus-wc-text-input"""
+    return re.sub(r'(?<!^)(?=[A-Z])', '-', name).lower()
+
+
+class ComponentGraph:
+    """Precomputed adjacency lists between Modus components
+
+    - `uses`: declared dependencies (`uses` / `dependsOn` in modus2_components.json, plus
+      the reverse of every `usedBy` entry), i.e. the children a component renders
+    - `used_by`: the reverse of `uses`
+    - `used_with`: components referenced in the knowledge base examples of a component,
+      most frequent first (e.g. ModusWcCollapse in the ModusWcAccordion examples)
+    """
+
+    def __init__(self, components, examples_by_framework):
+        """
+        Args:
+            components: Mapping of component name to ComponentRecord
+            examples_by_framework: Mapping of framework to {component name: ExampleRecord tuple}
+        """
+        by_tag = {component_tag(name): name for name in components}
+        by_lower = {name.lower(): name for name in components}
+
+        uses = {name: {} for name in components}
+        for name, record in components.items():
+            dependencies = record.dependencies or {}
+            for tag in (*dependencies.get("uses", ()), *dependencies.get("dependsOn", ())):
+                child = by_tag.get(tag)
+                if child is not None and child != name:
+                    uses[name][child] = None
+            for tag in dependencies.get("usedBy", ()):
+                parent = by_tag.get(tag)
+                if parent is not None and parent != name:
+                    uses[parent][name] = None
+        self.uses = {name: tuple(sorted(children)) for name, children in uses.items()}
+
+        used_by = {name: [] for name in components}
+        for name, children in self.uses.items():
+            for child in children:
+                used_by[child].append(name)
+        self.used_by = {name: tuple(sorted(parents)) for name, parents in used_by.items()}
+
+        # Count, per component, how many of its examples reference each other component
+        counts = {name: {} for name in components}
+        for examples in examples_by_framework.values():
+            for name, records in examples.items():
+                if name not in counts:
+                    continue
+                for example in records:
+                    referenced = set()
+                    for block in example.code_blocks:
+                        for reference in _COMPONENT_REFERENCE_PATTERN.findall(block.code):
+                            other = by_tag.get(reference) or by_lower.get(reference.lower())
+                            if other is not None and other != name:
+                                referenced.add(other)
+                    for other in referenced:
+                        counts[name][other] = counts[name].get(other, 0) + 1
+        self.used_with = {
+            name: tuple(sorted(others.items(), key=lambda item: (-item[1], item[0])))
+            for name, others in counts.items()
+        }
+
+    def __contains__(self, name):
+        return name in self.uses
+
+    def neighbours(self, name, relation):
+        """Names adjacent to `name` through one relation"""
+        if relation == "used_with":
+            return tuple(other for other, _ in self.used_with.get(name, ()))
+        return getattr(self, relation).get(name, ())
+
+    def related(self, name, depth=1, relations=DEFAULT_RELATIONS):
+        """Breadth-first walk from a component
+
+        Args:
+            name: The starting component
+            depth: Maximum number of edges from the start
+            relations: Relations to follow, a subset of RELATIONS
+
+        Returns:
+            list: One dict per reached component (excluding the start), nearest first,
+                with the relation and component it was first reached through
+        """
+        reached = {name: None}
+        found = []
+        queue = deque([(name, 0)])
+        while queue:
+            current, distance = queue.popleft()
+            if distance >= depth:
+                continue
+            for relation in relations:
+                for other in self.neighbours(current, relation):
+                    if other in reached:
+                        continue
+                    reached[other] = current
+                    found.append({"name": other, "tag": component_tag(other), "relation": relation,
+                                  "via": current, "distance": distance + 1})
+                    queue.append((other, distance + 1))
+        return found
@@ -1,53 +1,611 @@
 import os
+import sys
+import glob
 import json
+import time
+import logging
+import hashlib
+import threading
+from typing import NamedTuple
+
+from modules.component_graph import DEFAULT_RELATIONS, RELATIONS, ComponentGraph, component_tag
+from modules.doc_sections import DEFAULT_CHUNK_BYTES, MAX_CHUNK_BYTES, DocLibrary
+from modules.example_vectors import ExampleVectorIndex
+from modules.icon_index import IconIndex, check_limit
+from modules.kb_index import (DEFAULT_EXAMPLE_FIELDS, EXAMPLE_FIELDS, as_buffer, parse_component_section,
+                              parse_kb_examples, split_component_sections)
+from modules.kb_snapshot import DEFAULT_FRAMEWORK, KnowledgeBaseSnapshot, file_stamp
+from modules.metrics import metrics
+from modules.search_index import SearchIndex, build_search_documents
+from modules.snapshot_store import load_snapshot, save_snapshot
+from modules.snippet_validator import SnippetValidator
+
+logger = logging.getLogger(__name__)
+
+
+# Top-level fields of a component details response that callers can project
+COMPONENT_FIELDS = ("description", "properties", "events", "methods", "examples")
+
+
+class MemberRecord(NamedTuple):
+    """A property, event or method of a component, with the fields modus2_components.json gives it"""
+    name: str
+    type: str = None
+    description: str = None
+    default: str = None
+    required: bool = None
+    emits: str = None
+    # Any other (key, value) pairs of the entry, in file order
+    extra: tuple = ()
+
+    def to_dict(self):
+        """Return the entry as it appears in modus2_components.json (absent fields are left out)"""
+        # Unrolled: this runs for every member of every component in a details response
+        name, type_, description, default, required, emits, extra = self
+        result = {"name": name}
+        if type_ is not None:
+            result["type"] = type_
+        if description is not None:
+            result["description"] = description
+        if default is not None:
+            result["default"] = default
+        if required is not None:
+            result["required"] = required
+        if emits is not None:
+            result["emits"] = emits
+        if extra:
+            result.update(extra)
+        return result
+
+
+class ComponentRecord(NamedTuple):
+    """Immutable, pre-parsed entry from modus2_components.json
+    
+    Members are MemberRecord tuples rather than dicts, and every string is interned,
+    so the type, default and description strings repeated across components (like
+    "string | undefined") are stored once.
+    """
+    name: str
+    description: str
+    properties: tuple
+    events: tuple
+    methods: tuple
+    dependencies: dict
+    
+    def member_dicts(self, field):
+        """The properties, events or methods as a list of dicts, for responses"""
+        return [member.to_dict() for member in getattr(self, field)]
+
 
 class ComponentRegistry:
     """Registry for Modus 2.0 Web Components, handling component details and examples"""
     
-    def __init__(self):
+    def __init__(self, base_path=None):
+        """
+        Args:
+            base_path: Directory containing "Knowledge Base" (default: the repository root)
+        """
         # Paths for knowledge base files
-        self.base_path = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        self.base_path = base_path or os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
         self.components_path = os.path.join(self.base_path, "Knowledge Base", "modus2_components.json")
         self.combined_kb_path = os.path.join(self.base_path, "Knowledge Base", "Modus 2", "combined_modus2.md")
         self.react_kb_path = os.path.join(self.base_path, "Knowledge Base", "modus2_react_KB.md")
+        self.angular_kb_path = os.path.join(self.base_path, "Knowledge Base", "modus2_angular_KB.md")
+        # Example knowledge bases by framework, all in the same `# Component / ## Prompt N` format
+        self.kb_paths = {"react": self.react_kb_path, "angular": self.angular_kb_path}
         self.icons_path = os.path.join(self.base_path, "Knowledge Base", "modus_icons.json")
+        self.guidelines_path = os.path.join(self.base_path, "Knowledge Base", "Modus 2", "Modus2_guidelines.md")
+        # Long-form docs served section by section; ids are paths relative to "Knowledge Base/Modus 2"
+        self.docs_path = os.path.join(self.base_path, "Knowledge Base", "Modus 2")
+        guideline_files = sorted(glob.glob(os.path.join(self.docs_path, "guidelines", "*.md")))
+        self.doc_library = DocLibrary(self.docs_path, (self.combined_kb_path, self.guidelines_path, *guideline_files))
+        # Derived indexes are cached here so restarts can skip rebuilding them
+        self.search_index_path = os.path.join(self.base_path, ".cache", "search_index.pickle")
+        # Compiled snapshot of every parsed file, so short-lived processes skip parsing entirely
+        self.snapshot_path = os.path.join(self.base_path, ".cache", "kb_snapshot.pickle")
+        
+        # Parse every data file once, on first use; tool calls only do lookups on the current snapshot
+        self._reload_lock = threading.Lock()
+        self._reload_metrics = {
+            "initial_load_ms": None,
+            "initial_load_source": None,
+            "reload_count": 0,
+            "last_reload_ms": 0.0,
+            "last_reload_at": None,
+            "last_changed_files": [],
+            "last_reindexed_sections": 0
+        }
+        self._snapshot = None
     
-    def get_all_components(self):
-        """Get list of all available components from Modus 2.0"""
+    @staticmethod
+    def _read_source(path):
+        """Read a Knowledge Base file, returning its bytes and a content hash"""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        return raw, hashlib.blake2b(raw, digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _load_text(path):
+        """Read a markdown file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    @staticmethod
+    def _parse_components(text):
+        """Parse modus2_components.json into a name -> ComponentRecord dict
+        
+        Args:
+            text: The JSON text of the components file
+            
+        Returns:
+            dict: Mapping of component name to its ComponentRecord
+        """
+        data = _intern_strings(json.loads(text))
+        
+        # In Modus 2.0, component names are the top-level keys in the JSON
+        return {
+            name: ComponentRecord(
+                name=name,
+                description=component_data.get("description", ""),
+                properties=tuple(_member_record(entry) for entry in component_data.get("properties", [])),
+                events=tuple(_member_record(entry) for entry in component_data.get("events", [])),
+                methods=tuple(_member_record(entry) for entry in component_data.get("methods", [])),
+                dependencies=component_data.get("dependencies", {}),
+            )
+            for name, component_data in data.items()
+        }
+    
+    @staticmethod
+    def _parse_icons(text):
+        """Parse modus_icons.json into a tuple of icon names"""
+        return tuple(json.loads(text).get("icons", []))
+    
+    def _load_search_index(self, snapshot):
+        """Load the serialized search index for the snapshot's sources, building it if stale"""
+        source_hash = hashlib.blake2b(
+            "".join(snapshot.hashes.get(self._source_key(path), "")
+                    for path in self._search_source_paths()).encode("utf-8"),
+            digest_size=16
+        ).hexdigest()
+        search_index = SearchIndex.load(self.search_index_path, source_hash)
+        metrics.record_cache("search_index_disk", search_index is not None)
+        if search_index is not None:
+            logger.debug("Loaded search index from %s", self.search_index_path)
+            return search_index
+        
+        docs = {
+            os.path.basename(path): (snapshot.docs.get(self._source_key(path), ""), level)
+            for path, level in ((self.combined_kb_path, 1), (self.guidelines_path, 2))
+        }
+        documents = build_search_documents(snapshot.components, snapshot.examples, docs)
+        # snapshot.search_index is still the previous index, whose unchanged documents need no tokenizing
+        search_index = SearchIndex.build(documents, source_hash, previous=snapshot.search_index)
+        logger.info("Built search index with %d documents", len(documents))
         try:
-            # In Modus 2.0, all components are in a single JSON file
-            # Component names are the top-level keys in the JSON
-            with open(self.components_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Extract component names (all top-level keys)
-                components = list(data.keys())
-            
-            return components
+            search_index.save(self.search_index_path)
         except Exception as e:
-            print(f"Error getting component list: {e}")
-            return []
+            logger.error("Error saving search index to %s: %s", self.search_index_path, e)
+        return search_index
+    
+    def _search_source_paths(self):
+        return (self.components_path, *self.kb_paths.values(), self.combined_kb_path, self.guidelines_path)
+    
+    def _source_paths(self):
+        return (self.components_path, self.icons_path, *self.kb_paths.values(),
+                self.combined_kb_path, self.guidelines_path)
+    
+    def _source_key(self, path):
+        """Key a source file's stamp, hash and text are stored under in a snapshot"""
+        # Relative to base_path, so a compiled snapshot stays valid when the checkout is moved
+        return os.path.relpath(path, self.base_path).replace(os.sep, "/")
+    
+    def _load_initial_snapshot(self):
+        """Load the compiled snapshot, re-parsing only the sources that changed since it was written
+        
+        Falls back to parsing every source file if there is no usable compiled snapshot.
+        The result is written back as the new compiled snapshot whenever anything was parsed.
+        """
+        with self._reload_lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            start = time.perf_counter()
+            compiled, changed = load_snapshot(self.snapshot_path,
+                                              {self._source_key(path): path for path in self._source_paths()})
+            metrics.record_cache("kb_snapshot_disk", compiled is not None and not changed)
+            if compiled is None:
+                snapshot = self._build_snapshot(None)
+                source = "sources"
+            else:
+                # Generation 0, so the first snapshot of this process is generation 1 either way
+                compiled = compiled._replace(generation=0)
+                snapshot = self._build_snapshot(compiled)
+                if snapshot is compiled:
+                    snapshot = compiled._replace(generation=1)
+                    source = "compiled"
+                else:
+                    source = f"compiled ({len(changed)} stale file(s) re-parsed)"
+            self._snapshot = snapshot
+            self._reload_metrics["initial_load_ms"] = (time.perf_counter() - start) * 1000
+            self._reload_metrics["initial_load_source"] = source
+            logger.info("Loaded knowledge base from %s in %.1f ms", source, self._reload_metrics["initial_load_ms"])
+            if source != "compiled":
+                self._save_compiled_snapshot(snapshot)
+            return snapshot
+    
+    def _save_compiled_snapshot(self, snapshot):
+        try:
+            save_snapshot(snapshot, self.snapshot_path)
+        except Exception as e:
+            logger.error("Error saving compiled snapshot to %s: %s", self.snapshot_path, e)
+    
+    def compile_snapshot(self):
+        """Parse every Knowledge Base file from scratch and write the compiled snapshot
+        
+        Returns:
+            str: Path of the compiled snapshot file
+        """
+        with self._reload_lock:
+            snapshot = self._build_snapshot(None)
+            self._snapshot = snapshot
+        save_snapshot(snapshot, self.snapshot_path)
+        return self.snapshot_path
+    
+    def _build_snapshot(self, previous):
+        """Build a snapshot, re-parsing only the files whose stamp changed since `previous`
+        
+        If a changed file fails to parse (e.g. it is half-written by an editor), the
+        previous data for that file is kept and the new stamp is recorded, so the file
+        is retried on its next change.
+        
+        Args:
+            previous: The current KnowledgeBaseSnapshot, or None on first load
+            
+        Returns:
+            KnowledgeBaseSnapshot: The new snapshot, or `previous` if nothing changed
+        """
+        paths = self._source_paths()
+        kb_frameworks = {path: framework for framework, path in self.kb_paths.items()}
+        keys = {path: self._source_key(path) for path in paths}
+        stamps = {keys[path]: file_stamp(path) for path in paths}
+        if previous is None:
+            changed = set(paths)
+            base = KnowledgeBaseSnapshot(
+                generation=0, stamps={}, hashes={}, components={}, component_names=(), icons=(),
+                icon_index=IconIndex(()),
+                kb_contents={}, examples={}, kb_sections={}, docs={}, search_index=None, component_graph=None,
+                example_vectors=None, snippet_validator=None
+            )
+        else:
+            changed = {path for path in paths if stamps[keys[path]] != previous.stamps.get(keys[path])}
+            if not changed:
+                return previous
+            base = previous
+        
+        updates = {"generation": base.generation + 1, "stamps": stamps}
+        # Rebuilt from the current sources, so entries of files no longer read are dropped
+        hashes = {key: base.hashes[key] for key in keys.values() if key in base.hashes}
+        docs = {key: base.docs[key] for key in keys.values() if key in base.docs}
+        kb_contents = dict(base.kb_contents)
+        all_examples = dict(base.examples)
+        all_sections = dict(base.kb_sections)
+        reindexed_sections = 0
+        for path in paths:
+            if path not in changed:
+                continue
+            try:
+                raw, digest = self._read_source(path)
+                if path == self.components_path:
+                    components = self._parse_components(raw)
+                    updates["components"] = components
+                    updates["component_names"] = tuple(components)
+                elif path == self.icons_path:
+                    icons = self._parse_icons(raw)
+                    updates["icons"] = icons
+                    updates["icon_index"] = IconIndex(icons)
+                elif path in kb_frameworks:
+                    # Index each framework's knowledge base by component so example lookups are O(1)
+                    framework = kb_frameworks[path]
+                    previous_sections = all_sections.get(framework, {})
+                    # The records are byte ranges of this buffer, which is the only copy of the text
+                    examples, sections = parse_kb_examples(raw, previous_sections)
+                    reindexed_sections += len(sections.keys() - previous_sections.keys())
+                    kb_contents[framework] = raw
+                    all_examples[framework] = examples
+                    all_sections[framework] = sections
+                else:
+                    docs[keys[path]] = raw.decode('utf-8')
+                hashes[keys[path]] = digest
+            except Exception as e:
+                logger.error("Error loading %s: %s", path, e)
+        updates["hashes"] = hashes
+        updates["docs"] = docs
+        updates["kb_contents"] = kb_contents
+        updates["examples"] = all_examples
+        updates["kb_sections"] = all_sections
+        snapshot = base._replace(**updates)
+        
+        if snapshot.component_graph is None or any(path in changed for path in (self.components_path,
+                                                                                 *self.kb_paths.values())):
+            snapshot = snapshot._replace(component_graph=ComponentGraph(snapshot.components, snapshot.examples))
+        
+        if snapshot.example_vectors is None or any(path in changed for path in self.kb_paths.values()):
+            snapshot = snapshot._replace(example_vectors=ExampleVectorIndex(snapshot.examples))
+        
+        if snapshot.snippet_validator is None or any(path in changed for path in (self.components_path,
+                                                                                   self.icons_path)):
+            snapshot = snapshot._replace(snippet_validator=SnippetValidator(snapshot.components, snapshot.icon_index))
+        
+        if snapshot.search_index is None or any(path in changed for path in self._search_source_paths()):
+            snapshot = snapshot._replace(search_index=self._load_search_index(snapshot))
+        
+        self._reload_metrics["last_changed_files"] = sorted(os.path.basename(path) for path in changed)
+        self._reload_metrics["last_reindexed_sections"] = reindexed_sections
+        
+        return snapshot
+    
+    def reload_if_changed(self):
+        """Re-parse any Knowledge Base file that changed on disk and swap in a new snapshot
+        
+        Returns:
+            bool: True if a new snapshot was installed
+        """
+        if self._snapshot is None:
+            self._load_initial_snapshot()
+            return False
+        with self._reload_lock:
+            start = time.perf_counter()
+            previous = self._snapshot
+            snapshot = self._build_snapshot(previous)
+            if snapshot is previous:
+                return False
+            
+            # A single reference assignment: readers see either the old or the new snapshot
+            self._snapshot = snapshot
+            self._reload_metrics["reload_count"] += 1
+            self._reload_metrics["last_reload_ms"] = (time.perf_counter() - start) * 1000
+            self._reload_metrics["last_reload_at"] = time.time()
+            logger.info("Reloaded knowledge base (generation %d, changed: %s) in %.1f ms",
+                        snapshot.generation, ", ".join(self._reload_metrics["last_changed_files"]),
+                        self._reload_metrics["last_reload_ms"])
+        # Keep the compiled snapshot current so the next process starts from it
+        self._save_compiled_snapshot(snapshot)
+        return True
+    
+    def snapshot(self):
+        """Get the current immutable KnowledgeBaseSnapshot
+        
+        Callers that perform several lookups for one request should fetch the snapshot
+        once and use it throughout, so a concurrent reload cannot mix generations.
+        The snapshot is loaded on the first call.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._load_initial_snapshot()
+        return snapshot
+    
+    def is_loaded(self):
+        """Whether the snapshot is loaded, so snapshot() returns without reading or parsing any file"""
+        return self._snapshot is not None
+    
+    def get_reload_metrics(self):
+        """Get the snapshot generation and hot-reload timing metrics"""
+        return {"generation": self.snapshot().generation, **self._reload_metrics}
+    
+    def search(self, query, k=10, kind=None):
+        """Ranked full-text search over components, KB examples and documentation
+        
+        Args:
+            query: Free-text query
+            k: Maximum number of hits to return
+            kind: Optional filter: "component", "example" or "doc"
+            
+        Returns:
+            list: Hits, best first
+        """
+        return self.snapshot().search_index.search(query, k, kind)
+    
+    def find_similar_examples(self, queries, k=5, framework=None, include=("question",)):
+        """Find the knowledge base prompts whose user question is most similar to each query
+        
+        Args:
+            queries: A query string, or a list of them to score in one batch
+            k: Maximum number of examples per query
+            framework: Only search this framework's knowledge base (default: all of them)
+            include: Example text fields to return, a subset of EXAMPLE_FIELDS
+            
+        Returns:
+            list: Matches for a single query, or one list of matches per query for a list
+            
+        Raises:
+            ValueError: If include names an unknown field or k is not positive
+        """
+        include = _validate_selection(include, EXAMPLE_FIELDS, "include")
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        single = isinstance(queries, str)
+        batches = self.snapshot().example_vectors.search(
+            [queries] if single else list(queries), k, framework.lower() if framework else None
+        )
+        results = [
+            [
+                {"component": example.component, "framework": example_framework, "score": round(score, 4),
+                 **example.to_dict(include)}
+                for score, example_framework, example in matches
+            ]
+            for matches in batches
+        ]
+        return results[0] if single else results
+    
+    def get_knowledge_base_content(self):
+        """Get the full markdown text of the React knowledge base"""
+        return self.snapshot().kb_content
+    
+    def get_component_examples(self, component_name, framework=None):
+        """Get the indexed knowledge base examples for a component
+        
+        Args:
+            component_name: The component name to find examples for
+            framework: The framework to use ("react" or "angular", default "react"). Components
+                without examples for the framework fall back to the React examples.
+            
+        Returns:
+            list: List of examples for the component
+        """
+        examples, _, _ = self.snapshot().resolve_examples(component_name, framework)
+        return [example.to_dict() for example in examples]
+    
+    def get_component_details(self, component_name, framework=None, fields=None, include=None,
+                              max_examples=None, offset=0, snapshot=None):
+        """Get a projected, paginated view of a component's details and examples
+        
+        Args:
+            component_name: The component to describe
+            framework: The framework to return examples for (default "react")
+            fields: Top-level fields to return, a subset of COMPONENT_FIELDS (default: all)
+            include: Example text fields to return, a subset of EXAMPLE_FIELDS (default: all but code_blocks)
+            max_examples: Maximum number of examples to return (default: no limit)
+            offset: Index of the first example to return
+            snapshot: The KnowledgeBaseSnapshot to read from (default: the current one)
+            
+        Returns:
+            dict: The requested fields, or None if the component is unknown
+            
+        Raises:
+            ValueError: If fields or include name an unknown field, or the paging values are negative
+        """
+        fields = _validate_selection(fields, COMPONENT_FIELDS, "fields")
+        include = _validate_selection(include, EXAMPLE_FIELDS, "include", DEFAULT_EXAMPLE_FIELDS)
+        if offset < 0 or (max_examples is not None and max_examples < 0):
+            raise ValueError("offset and max_examples must not be negative")
+        
+        snapshot = snapshot or self.snapshot()
+        record = snapshot.get_component(component_name)
+        if record is None or not record.properties:
+            return None
+        
+        details = {}
+        for field in fields:
+            if field == "examples":
+                examples, examples_framework, fallback = snapshot.resolve_examples(component_name, framework)
+                end = len(examples) if max_examples is None else offset + max_examples
+                page = examples[offset:end]
+                details["examples"] = [example.to_dict(include) for example in page]
+                details["example_count"] = len(examples)
+                details["example_offset"] = offset
+                details["has_more_examples"] = end < len(examples)
+                details["examples_framework"] = examples_framework
+                # True when the requested framework has no examples and the default ones are returned
+                details["examples_fallback"] = fallback
+            elif field == "description":
+                details[field] = record.description
+            else:
+                details[field] = record.member_dicts(field)
+        return details
+    
+    def get_components_details(self, component_names, framework=None, fields=None, include=None,
+                               max_examples=None, dedupe_shared=True):
+        """Get details for several components from one snapshot in a single response
+        
+        Args:
+            component_names: The components to describe; duplicates are returned once
+            framework: The framework to return examples for (default "react")
+            fields: Top-level fields to return, a subset of COMPONENT_FIELDS (default: all)
+            include: Example text fields to return, a subset of EXAMPLE_FIELDS (default: all but code_blocks)
+            max_examples: Maximum number of examples per component (default: no limit)
+            dedupe_shared: Move property/event definitions that are identical across two or
+                more of the components into `shared_properties` / `shared_events`, leaving
+                only their names in each component
+            
+        Returns:
+            dict: `components` keyed by name, `unknown` names, and the shared definitions
+        """
+        snapshot = self.snapshot()
+        components = {}
+        unknown = []
+        for component_name in dict.fromkeys(component_names):
+            details = self.get_component_details(
+                component_name, framework=framework, fields=fields, include=include,
+                max_examples=max_examples, snapshot=snapshot
+            )
+            if details is None:
+                unknown.append(component_name)
+            else:
+                components[component_name] = details
+        
+        result = {"generation": snapshot.generation, "components": components, "unknown": unknown}
+        if dedupe_shared:
+            for field in ("properties", "events"):
+                shared = _hoist_shared_definitions(components, field)
+                if shared:
+                    result[f"shared_{field}"] = shared
+        return result
+    
+    def get_component(self, component_name):
+        """Get the pre-parsed ComponentRecord for a component, or None if unknown"""
+        return self.snapshot().get_component(component_name)
+    
+    def get_all_components(self):
+        """Get list of all available components from Modus 2.0"""
+        return list(self.snapshot().component_names)
     
     def get_component_properties_and_events(self, component_name):
         """Get properties, events and description for a specific component"""
-        try:
-            with open(self.components_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        snapshot = self.snapshot()
+        record = snapshot.get_component(component_name)
+        if record is None:
+            return {"properties": [], "events": [], "methods": [], "description": "", "uses": [], "used_by": []}
+        
+        return {
+            "properties": record.member_dicts("properties"),
+            "events": record.member_dicts("events"),
+            "methods": record.member_dicts("methods"),
+            "description": record.description,
+            "uses": list(snapshot.component_graph.uses.get(component_name, ())),
+            "used_by": list(snapshot.component_graph.used_by.get(component_name, ()))
+        }
+    
+    def get_related_components(self, component_name, depth=1, relations=None, fields=None, framework=None,
+                               max_examples=0):
+        """Get the components related to a component, optionally with their details
+        
+        Args:
+            component_name: The component to start from
+            depth: How many edges to follow (1 = direct neighbours)
+            relations: Relations to follow, a subset of RELATIONS (default: uses, used_with)
+            fields: If given, also return these COMPONENT_FIELDS for the component and
+                every related component, as get_components_details does
+            framework: The framework to return examples for, when fields include examples
+            max_examples: Maximum number of examples per component in the details
             
-            # In Modus 2.0, component data is directly accessible with the component name as the key
-            if component_name in data:
-                component_data = data[component_name]
-                return {
-                    "properties": component_data.get("properties", []),
-                    "events": component_data.get("events", []),
-                    "methods": component_data.get("methods", []),
-                    "description": component_data.get("description", "")
-                }
+        Returns:
+            dict: Direct neighbours by relation, the `related` walk and optional `details`,
+                or None if the component is unknown
             
-            return {"properties": [], "events": [], "methods": [], "description": ""}
+        Raises:
+            ValueError: If relations name an unknown relation or depth is negative
+        """
+        relations = _validate_selection(relations or DEFAULT_RELATIONS, RELATIONS, "relations")
+        if depth < 0:
+            raise ValueError("depth must not be negative")
         
-        except Exception as e:
-            print(f"Error getting component properties: {e}")
-            return {"properties": [], "events": [], "methods": [], "description": ""}
+        snapshot = self.snapshot()
+        graph = snapshot.component_graph
+        if component_name not in graph:
+            return None
+        
+        result = {
+            "tag": component_tag(component_name),
+            "uses": list(graph.uses[component_name]),
+            "used_by": list(graph.used_by[component_name]),
+            "used_with": [{"name": name, "examples": count} for name, count in graph.used_with[component_name]],
+            "related": graph.related(component_name, depth, relations),
+        }
+        if fields:
+            names = [component_name, *(entry["name"] for entry in result["related"])]
+            result["details"] = self.get_components_details(
+                names, framework=framework, fields=fields, max_examples=max_examples
+            )
+        return result
             
     def _extract_kb_examples(self, content, component_name, framework=None):
         """Extract examples for a specific component from the knowledge base
@@ -55,20 +613,19 @@ class ComponentRegistry:
         Args:
             content: The content to extract from
             component_name: The component name to find examples for
-            framework: The framework to use (not used in Modus 2.0 currently)
+            framework: The framework whose knowledge base `content` is (default "react")
             
         Returns:
             list: List of examples for the component
         """
-        examples = []
         try:
-            # Use the content passed directly rather than reading from a file again
-            print(f"Extracting {component_name} examples from the knowledge base")
-            examples = self._extract_examples_from_markdown_content(content, component_name)
-            
-            return examples       
+            # The loaded knowledge bases are already indexed; only foreign content needs parsing
+            kb_buffer = self.snapshot().kb_contents.get((framework or DEFAULT_FRAMEWORK).lower(), b"")
+            if as_buffer(content) == kb_buffer:
+                return self.get_component_examples(component_name, framework)
+            return self._extract_examples_from_markdown_content(content, component_name)
         except Exception as e:
-            print(f"Error extracting examples: {e}")
+            logger.error("Error extracting examples: %s", e)
             return []
             
     def _extract_examples_from_content(self, kb_path, component_name, framework=None):
@@ -79,130 +636,237 @@ class ComponentRegistry:
             
             return self._extract_examples_from_markdown_content(content, component_name)
         except Exception as e:
-            print(f"Error extracting examples from {kb_path}: {e}")
+            logger.error("Error extracting examples from %s: %s", kb_path, e)
             return []
+    
     def _extract_examples_from_markdown_content(self, content, component_name, framework=None):
         """Extract examples directly from markdown content - keeps full prompt sections intact"""
-        try:            
-            # Find the component section
-            print(f"Searching for {component_name} examples in React KB")
-            print(f"Looking for component: {component_name} in markdown content")
-            
-            # For Modus 2.0, component headers are directly with the component name
-            component_marker = f"# {component_name}"
-            start_index = content.find(component_marker)
-            
-            if start_index == -1:
-                print(f"Component {component_name} not found in knowledge base")
-                return []
-            
-            print(f"Found component marker: '{component_marker}' at position {start_index}")
-            
-            # Find the next component section or end of file
-            next_component_index = content.find("\n# ", start_index + 1)
-            if next_component_index == -1:
-                # If this is the last component in the file
-                component_section = content[start_index:]
-            else:
-                component_section = content[start_index:next_component_index]
-                
-            # Extract full prompt sections
-            examples = []
-            
-            # Split the component section by prompt markers
-            prompt_sections = component_section.split("## Prompt")
-            
-            # Skip the first part which contains the component header
-            if len(prompt_sections) > 1:
-                print(f"Found {len(prompt_sections)-1} prompt sections for {component_name}")
-                
-                for i, section in enumerate(prompt_sections[1:], 1):
-                    # Extract useful data for reference
-                    prompt_number = i
-                    full_content = f"## Prompt{section}"
-                    
-                    # Extract code blocks for additional indexing
-                    code = ""
-                    code_markers = ["```tsx", "```jsx", "```typescript", "```javascript", "```"]
-                    for marker in code_markers:
-                        code_start = section.find(marker)
-                        if code_start != -1:
-                            code_end = section.find("```", code_start + len(marker))
-                            if code_end != -1:
-                                code = section[code_start + len(marker):code_end].strip()
-                                break
-                                
-                    # Extract question for additional indexing
-                    question = ""
-                    question_marker = "**User Question:**"
-                    question_start = section.find(question_marker)
-                    if question_start != -1:
-                        answer_marker = "**Agent Answer:**"
-                        answer_start = section.find(answer_marker, question_start)
-                        if answer_start != -1:
-                            question = section[question_start + len(question_marker):answer_start].strip()
-                            
-                    # Create a dictionary with the full content and metadata
-                    example = {
-                        "prompt_number": prompt_number,
-                        "content": full_content,
-                        # Include these for backward compatibility and search indexing
-                        "question": question,
-                        "code": code
-                    }
-                    
-                    examples.append(example)
-            else:
-                print(f"No prompt sections found for {component_name}")
-                    
-            return examples
+        try:
+            # Only the component's own section is parsed; the rest of the file is just scanned for headings
+            content = as_buffer(content)
+            for component, start, end in split_component_sections(content):
+                if component == component_name:
+                    examples = parse_component_section(content, component, start, end,
+                                                       content.count(b"\n", 0, start) + 1)
+                    return [example.to_dict() for example in examples]
+            return []
         except Exception as e:
-            print(f"Error extracting examples from markdown content: {e}")
+            logger.error("Error extracting examples from markdown content: %s", e)
             return []
     
     def get_installation_guidelines(self):
         """Get installation and usage guidelines"""
         try:
-            guidelines_path = os.path.join(self.base_path, "Knowledge Base", "Modus 2", "Modus2_guidelines.md")
-            with open(guidelines_path, 'r', encoding='utf-8') as f:
-                guidelines = f.read()
+            # Loaded (and hot-reloaded) with the rest of the snapshot; read the file only if that failed
+            guidelines = self.snapshot().docs.get(self._source_key(self.guidelines_path))
+            if guidelines is None:
+                guidelines = self._load_text(self.guidelines_path)
             return guidelines
         except Exception as e:
-            print(f"Error loading guidelines: {e}")
+            logger.error("Error loading guidelines: %s", e)
             return "Guidelines not available."
     
-    def get_all_icon_names(self):
-        """Get a list of all available Modus icon names"""
-        try:
-            with open(self.icons_path, 'r', encoding='utf-8') as f:
-                icons_data = json.load(f)
-            return icons_data.get("icons", [])
-        except Exception as e:
-            print(f"Error loading icon names: {e}")
-            return []
+    def get_doc_section(self, path=None, heading=None, offset=0, max_bytes=DEFAULT_CHUNK_BYTES):
+        """Get one section of a long-form document, or the document list / heading outline
+        
+        Args:
+            path: Document id such as "combined_modus2.md" or "guidelines/react-integration.md".
+                Without it, the available documents are listed.
+            heading: Section to return: a heading title, an anchor slug, or a path of
+                headings like "modus-wc-button > Properties". Without it, the
+                document's heading outline is returned.
+            offset: Byte offset within the section, from a previous chunk's next_offset
+            max_bytes: Maximum chunk size in bytes
+            
+        Returns:
+            dict: The section chunk, outline or document list
+            
+        Raises:
+            ValueError: If the document or heading is unknown, or offset is negative
+        """
+        if offset < 0:
+            raise ValueError("offset must not be negative")
+        library = self.doc_library
+        if not path:
+            return {"documents": library.list_documents()}
+        
+        doc_id = library.resolve_path(path)
+        if doc_id is None:
+            raise ValueError(f"Unknown document '{path}'. Available: {', '.join(library.paths)}")
+        if not heading:
+            return {"path": doc_id, "sections": library.outline(doc_id)}
+        
+        section, other_matches = library.find_section(doc_id, heading)
+        if section is None:
+            suggestions = library.suggest(doc_id, heading)
+            hint = f" Did you mean: {'; '.join(suggestions)}?" if suggestions else ""
+            raise ValueError(f"Heading '{heading}' not found in {doc_id}.{hint}")
+        
+        max_bytes = min(max(int(max_bytes or DEFAULT_CHUNK_BYTES), 1), MAX_CHUNK_BYTES)
+        text, next_offset = library.read_section(doc_id, section, offset, max_bytes)
+        result = {
+            "path": doc_id,
+            **section.to_dict(),
+            "offset": offset,
+            "content": text,
+            "has_more": next_offset is not None,
+            "next_offset": next_offset,
+        }
+        if other_matches:
+            result["other_matches"] = other_matches[:10]
+        return result
+    
+    def get_all_icon_names(self, limit=None, snapshot=None):
+        """Get a list of all available Modus icon names
+        
+        Args:
+            limit (int): Maximum number of names to return (default: no limit)
+            snapshot: The KnowledgeBaseSnapshot to read from (default: the current one)
+            
+        Raises:
+            ValueError: If limit is negative
+        """
+        check_limit(limit)
+        icons = (snapshot or self.snapshot()).icons
+        return list(icons if limit is None else icons[:limit])
     
-    def get_icon_names_by_char(self, char_prefix):
+    def get_icon_names_by_char(self, char_prefix, limit=None, snapshot=None):
         """Get a list of icon names starting with a specific character
         
         Args:
             char_prefix (str): The character prefix to filter icons by
+            limit (int): Maximum number of names to return (default: no limit)
+            snapshot: The KnowledgeBaseSnapshot to read from (default: the current one)
             
         Returns:
             list: List of icon names starting with the specified character
+            
+        Raises:
+            ValueError: If limit is negative
         """
+        check_limit(limit)
         try:
             if not char_prefix:
                 return []
-                
-            all_icons = self.get_all_icon_names()
-            
-            # Convert to lowercase for case-insensitive matching
-            prefix = char_prefix.lower()
-            
-            # Filter icons starting with the specified character
-            matching_icons = [icon for icon in all_icons if icon.lower().startswith(prefix)]
             
-            return matching_icons
+            # Case-insensitive bisect range query over the sorted icon index
+            return (snapshot or self.snapshot()).icon_index.prefix(char_prefix, limit)
         except Exception as e:
-            print(f"Error getting icons by character prefix: {e}")
+            logger.error("Error getting icons by character prefix: %s", e)
             return []
+    
+    def get_icon_names_containing(self, text, limit=None, snapshot=None):
+        """Get icon names containing `text` anywhere (case-insensitive), using the trigram index
+        
+        Raises:
+            ValueError: If limit is negative
+        """
+        check_limit(limit)
+        try:
+            return (snapshot or self.snapshot()).icon_index.substring(text, limit)
+        except Exception as e:
+            logger.error("Error getting icons by substring: %s", e)
+            return []
+    
+    def resolve_icon(self, name, suggestion_limit=5):
+        """Validate an icon name exactly, suggesting close matches if it does not exist
+        
+        Args:
+            name (str): The icon name to validate (case-insensitive)
+            suggestion_limit (int): Maximum number of "did you mean" suggestions
+            
+        Returns:
+            dict: `valid`, the canonical `icon` name (or None) and `suggestions` for invalid names
+        """
+        icon_index = self.snapshot().icon_index
+        icon = icon_index.resolve(name)
+        if icon is not None:
+            return {"valid": True, "icon": icon, "suggestions": []}
+        return {"valid": False, "icon": None, "suggestions": icon_index.suggest(name, suggestion_limit)}
+    
+    def validate_snippet(self, code, framework=None):
+        """Check the Modus component tags of generated code against the component schemas
+        
+        Args:
+            code: JSX/TSX, Angular template or HTML source
+            framework: "react", "angular" or "html" (default: inferred per tag)
+            
+        Returns:
+            dict: `valid` and every unknown component, property or event, invalid
+                enum value and invalid icon name, with line numbers and suggestions
+            
+        Raises:
+            ValueError: If the framework is unknown
+        """
+        return self.snapshot().snippet_validator.validate(code, framework)
+
+def _intern_strings(value):
+    """Copy of parsed JSON with every string interned, so equal strings share one object"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {sys.intern(key): _intern_strings(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_intern_strings(item) for item in value]
+    return value
+
+
+def _member_record(entry):
+    """MemberRecord for one properties/events/methods entry of modus2_components.json"""
+    known = {field: entry[field] for field in MemberRecord._fields[:-1] if field in entry}
+    extra = tuple((key, value) for key, value in entry.items() if key not in known)
+    return MemberRecord(**known, extra=extra)
+
+
+def _validate_selection(selection, allowed, argument_name, default=None):
+    """Return `selection` in canonical order, or `default` (all of `allowed`) if it is empty"""
+    if not selection:
+        return allowed if default is None else default
+    unknown = set(selection) - set(allowed)
+    if unknown:
+        raise ValueError(
+            f"Unknown {argument_name}: {', '.join(sorted(unknown))}. Allowed values: {', '.join(allowed)}"
+        )
+    return tuple(field for field in allowed if field in selection)
+
+
+def _hoist_shared_definitions(components, field):
+    """Replace definitions repeated verbatim across components with references to one shared copy
+    
+    A definition is hoisted if it appears verbatim in at least two components. If one
+    name has several such variants, only the most common one is hoisted and the others
+    stay inline. The component keeps the hoisted names in `shared_<field>` next to its
+    remaining, component-specific definitions.
+    
+    Returns:
+        dict: Mapping of hoisted name to its single shared definition
+    """
+    occurrences = {}
+    for details in components.values():
+        for definition in details.get(field, ()):
+            key = tuple(sorted(definition.items()))
+            occurrences.setdefault(definition.get("name"), {}).setdefault(key, []).append(definition)
+    
+    shared = {}
+    for name, variants in occurrences.items():
+        definitions = max(variants.values(), key=len)
+        if len(definitions) > 1:
+            shared[name] = definitions[0]
+    if not shared:
+        return shared
+    
+    for details in components.values():
+        if field not in details:
+            continue
+        own = []
+        hoisted = []
+        for definition in details[field]:
+            name = definition.get("name")
+            if name in shared and definition == shared[name]:
+                hoisted.append(name)
+            else:
+                own.append(definition)
+        details[field] = own
+        if hoisted:
+            details[f"shared_{field}"] = hoisted
+    return shared
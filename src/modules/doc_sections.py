@@ -0,0 +1,205 @@
+import os
+import re
+import mmap
+import threading
+from typing import NamedTuple
+
+from modules.kb_snapshot import file_stamp
+
+# ATX headings (`#` to `######`) at the start of a line; fenced code is skipped separately
+_HEADING_PATTERN = re.compile(rb'^(#{1,6})[ \t]+(.+?)[ \t#]*$')
+_FENCE_PATTERN = re.compile(rb'^[ \t]*(```|~~~)')
+
+# Separator between ancestor headings in a section path, e.g. "modus-wc-button > Properties"
+PATH_SEPARATOR = " > "
+
+# Default and maximum size of one chunk returned for a section
+DEFAULT_CHUNK_BYTES = 16384
+MAX_CHUNK_BYTES = 65536
+
+
+class DocSection(NamedTuple):
+    """A heading and the byte range of its section (up to the next heading of the same or higher level)"""
+    title: str
+    level: int
+    path: str
+    start: int
+    end: int
+    parent: int
+
+    def to_dict(self):
+        return {"heading": self.title, "level": self.level, "heading_path": self.path, "bytes": self.end - self.start}
+
+
+def slugify(title):
+    """GitHub-style anchor for a heading, so `#depends-on` style references resolve"""
+    return re.sub(r'[^\w\- ]', '', title.lower()).strip().replace(" ", "-")
+
+
+def parse_heading_tree(data):
+    """Index the headings of a markdown document in one pass over its bytes
+
+    Lines inside fenced code blocks are ignored, so `# comment` lines in shell
+    snippets are not mistaken for headings.
+
+    Args:
+        data: The document as bytes (or a bytes-like object such as an mmap)
+
+    Returns:
+        tuple: DocSection records in document order; `parent` is the index of the
+            enclosing section, or -1 for top-level headings
+    """
+    headings = []
+    in_fence = False
+    position = 0
+    size = len(data)
+    while position < size:
+        line_end = data.find(b"\n", position)
+        if line_end == -1:
+            line_end = size
+        line = data[position:line_end].rstrip(b"\r")
+        if _FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence and line.startswith(b"#"):
+            match = _HEADING_PATTERN.match(line)
+            if match:
+                headings.append((len(match.group(1)), match.group(2).decode("utf-8", "replace"), position))
+        position = line_end + 1
+
+    sections = []
+    stack = []
+    for i, (level, title, start) in enumerate(headings):
+        # A section ends where the next heading of the same or a higher level starts
+        while stack and sections[stack[-1]].level >= level:
+            closed = stack.pop()
+            sections[closed] = sections[closed]._replace(end=start)
+        parent = stack[-1] if stack else -1
+        path = sections[parent].path + PATH_SEPARATOR + title if parent >= 0 else title
+        sections.append(DocSection(title, level, path, start, size, parent))
+        stack.append(i)
+    return tuple(sections)
+
+
+class _IndexedDocument(NamedTuple):
+    stamp: tuple
+    size: int
+    sections: tuple
+
+
+class DocLibrary:
+    """Heading-tree index over markdown documents, serving single sections by mmap slicing
+
+    Each document is indexed lazily on first use and re-indexed when its
+    mtime/inode/size stamp changes. Section text is never held in memory: reads map
+    the file and slice out the requested byte range, so returning a 2 KB section
+    of a 130 KB document touches only those pages.
+    """
+
+    def __init__(self, root, paths):
+        """
+        Args:
+            root: Directory that document ids are relative to
+            paths: Absolute paths of the documents to serve
+        """
+        self.root = root
+        self.paths = {os.path.relpath(path, root).replace(os.sep, "/"): path for path in paths}
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def list_documents(self):
+        """Get the id and size of every document"""
+        documents = []
+        for doc_id, path in self.paths.items():
+            stamp = file_stamp(path)
+            if stamp is not None:
+                documents.append({"path": doc_id, "bytes": stamp[2]})
+        return documents
+
+    def resolve_path(self, doc):
+        """Map a document id or file name to its id, or None if unknown"""
+        if doc in self.paths:
+            return doc
+        doc = doc.replace("\\", "/").lstrip("/")
+        for doc_id in self.paths:
+            if doc_id.endswith("/" + doc) or os.path.basename(doc_id) == doc:
+                return doc_id
+        return None
+
+    def _index(self, doc_id):
+        path = self.paths[doc_id]
+        stamp = file_stamp(path)
+        if stamp is None:
+            raise FileNotFoundError(path)
+        index = self._indexes.get(doc_id)
+        if index is not None and index.stamp == stamp:
+            return index
+        with self._lock:
+            index = self._indexes.get(doc_id)
+            if index is None or index.stamp != stamp:
+                with open(path, "rb") as f:
+                    sections = parse_heading_tree(f.read())
+                index = _IndexedDocument(stamp, stamp[2], sections)
+                self._indexes[doc_id] = index
+            return index
+
+    def outline(self, doc_id, max_level=6):
+        """Get a document's heading tree as a flat list in document order"""
+        return [section.to_dict() for section in self._index(doc_id).sections if section.level <= max_level]
+
+    def find_section(self, doc_id, heading):
+        """Find a section by path ("A > B"), exact title, case-insensitive title or anchor slug
+
+        Returns:
+            tuple: (DocSection or None, list of other matching section paths)
+        """
+        sections = self._index(doc_id).sections
+        wanted = heading.strip().lstrip("#").strip()
+        lowered = wanted.lower()
+        # Tolerate "A>B" and "A / B" as path separators
+        parts = [part.strip().lower() for part in re.split(r'\s*(?:>|/)\s*', wanted) if part.strip()]
+        matchers = (
+            lambda section: section.path == wanted,
+            lambda section: section.title == wanted,
+            lambda section: section.title.lower() == lowered,
+            lambda section: [part.lower() for part in section.path.split(PATH_SEPARATOR)][-len(parts):] == parts,
+            lambda section: slugify(section.title) == slugify(wanted),
+        )
+        for matches in matchers:
+            found = [section for section in sections if matches(section)]
+            if found:
+                return found[0], [section.path for section in found[1:]]
+        return None, []
+
+    def suggest(self, doc_id, heading, limit=5):
+        """Get section paths whose title contains the requested heading text"""
+        lowered = heading.strip().lower()
+        return [section.path for section in self._index(doc_id).sections if lowered in section.title.lower()][:limit]
+
+    def read_section(self, doc_id, section, offset=0, max_bytes=DEFAULT_CHUNK_BYTES):
+        """Read one chunk of a section by slicing the memory-mapped file
+
+        The chunk end is moved back to a UTF-8 character boundary so every chunk
+        decodes on its own.
+
+        Args:
+            doc_id: Document id
+            section: DocSection to read
+            offset: Byte offset within the section to start at
+            max_bytes: Maximum chunk size in bytes
+
+        Returns:
+            tuple: (text, next offset within the section or None when the section is complete)
+        """
+        start = section.start + max(offset, 0)
+        if start >= section.end:
+            return "", None
+        with open(self.paths[doc_id], "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # If the file shrank since it was indexed, the section ends where the file does
+                section_end = min(section.end, mapped.size())
+                end = min(start + max_bytes, section_end)
+                while start < end < section_end and (mapped[end] & 0xC0) == 0x80:
+                    end -= 1
+                chunk = mapped[start:end]
+        next_offset = end - section.start if end < section_end else None
+        return chunk.decode("utf-8", "replace"), next_offset
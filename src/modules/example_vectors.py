@@ -0,0 +1,163 @@
+import math
+import heapq
+from array import array
+
+from modules.search_index import tokenize
+
+# Below this many examples, per-call NumPy overhead outweighs vectorized scoring
+NUMPY_MIN_EXAMPLES = 1000
+
+# NumPy is optional and only imported once an index is large enough to use it, so it adds
+# nothing to server startup: None until then, False if it is not installed
+np = None
+
+
+def _numpy():
+    """The numpy module, imported on first use, or None if it is not installed"""
+    global np
+    if np is None:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = False
+    return np or None
+
+
+def _features(text):
+    """Unigram and adjacent-bigram features of a text, so "with icons" outranks "icons" alone"""
+    tokens = tokenize(text)
+    return tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+
+def _example_text(example):
+    # The question is what an agent's request resembles; the component name disambiguates short ones
+    return f"{example.component} {example.question or example.content[:300]}"
+
+
+def _top_k(scores, k):
+    """Indexes of the k highest positive scores in a NumPy vector, best first"""
+    count = min(k, len(scores))
+    if count <= 0:
+        return []
+    top = np.argpartition(-scores, count - 1)[:count]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return [i for i in top.tolist() if scores[i] > 0]
+
+
+class ExampleVectorIndex:
+    """TF-IDF vectors of every knowledge base prompt, for offline similarity search
+
+    Each example's user question is a sparse TF-IDF vector (sublinear term frequency,
+    smoothed IDF, L2-normalized) over a vocabulary of word unigrams and bigrams, so a
+    cosine score is a sparse dot product. The vectors are stored column-wise (per
+    feature, the rows containing it and their weights) in flat arrays: a query only
+    touches the columns of its own features. With NumPy and a large enough index,
+    the same arrays are viewed as NumPy arrays and each query's scores are
+    accumulated with vectorized scatter-adds; otherwise they are scored in pure Python.
+    """
+
+    def __init__(self, examples_by_framework):
+        """
+        Args:
+            examples_by_framework: Mapping of framework to {component name: ExampleRecord tuple}
+        """
+        self.entries = tuple(
+            (framework, example)
+            for framework, examples in sorted(examples_by_framework.items())
+            for records in examples.values()
+            for example in records
+        )
+        self.frameworks = tuple(framework for framework, _ in self.entries)
+        counts = []
+        document_frequency = {}
+        for _, example in self.entries:
+            features = {}
+            for feature in _features(_example_text(example)):
+                features[feature] = features.get(feature, 0) + 1
+            counts.append(features)
+            for feature in features:
+                document_frequency[feature] = document_frequency.get(feature, 0) + 1
+
+        doc_count = len(self.entries)
+        self.vocabulary = {feature: column for column, feature in enumerate(sorted(document_frequency))}
+        self.idf = array("d", bytes(8 * len(self.vocabulary)))
+        for feature, column in self.vocabulary.items():
+            self.idf[column] = math.log((1 + doc_count) / (1 + document_frequency[feature])) + 1
+
+        columns = [[] for _ in self.vocabulary]
+        for row, features in enumerate(counts):
+            for column, weight in self._weights(features).items():
+                columns[column].append((row, weight))
+
+        # Compressed sparse columns: rows[starts[c]:starts[c + 1]] contain feature c
+        self.column_starts = array("q", [0])
+        self.column_rows = array("i")
+        self.column_weights = array("d")
+        for entries in columns:
+            self.column_rows.extend(row for row, _ in entries)
+            self.column_weights.extend(weight for _, weight in entries)
+            self.column_starts.append(len(self.column_rows))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _weights(self, features):
+        """L2-normalized TF-IDF weights of a feature -> count mapping, keyed by vocabulary column"""
+        weights = {}
+        for feature, count in features.items():
+            column = self.vocabulary.get(feature)
+            if column is not None:
+                weights[column] = (1 + math.log(count)) * self.idf[column]
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {column: weight / norm for column, weight in weights.items()} if norm else {}
+
+    def _query_weights(self, query):
+        features = {}
+        for feature in _features(query):
+            features[feature] = features.get(feature, 0) + 1
+        return self._weights(features)
+
+    def search(self, queries, k=5, framework=None):
+        """Cosine top-k examples for each of several queries
+
+        Args:
+            queries: Query strings
+            k: Maximum number of matches per query
+            framework: Only return examples from this framework's knowledge base
+
+        Returns:
+            list: Per query, a list of (score, framework, ExampleRecord), best first;
+                examples sharing no feature with the query are never returned
+        """
+        results = []
+        if len(self.entries) >= NUMPY_MIN_EXAMPLES and _numpy() is not None:
+            # Zero-copy views of the column arrays
+            starts = np.frombuffer(self.column_starts, dtype=np.int64)
+            rows = np.frombuffer(self.column_rows, dtype=np.int32)
+            weights = np.frombuffer(self.column_weights, dtype=np.float64)
+            excluded = None
+            if framework:
+                excluded = np.array([entry_framework != framework for entry_framework in self.frameworks])
+            for query in queries:
+                scores = np.zeros(len(self.entries))
+                for column, query_weight in self._query_weights(query).items():
+                    start, end = starts[column], starts[column + 1]
+                    # Rows are unique within a column, so a fancy-index add is a correct scatter-add
+                    scores[rows[start:end]] += query_weight * weights[start:end]
+                if excluded is not None:
+                    scores[excluded] = 0.0
+                results.append([(float(scores[row]), *self.entries[row]) for row in _top_k(scores, k)])
+            return results
+
+        for query in queries:
+            scores = {}
+            for column, query_weight in self._query_weights(query).items():
+                start, end = self.column_starts[column], self.column_starts[column + 1]
+                for row, weight in zip(self.column_rows[start:end], self.column_weights[start:end]):
+                    scores[row] = scores.get(row, 0.0) + query_weight * weight
+            if framework:
+                scores = {row: score for row, score in scores.items() if self.frameworks[row] == framework}
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            results.append([(score, *self.entries[row]) for row, score in top if score > 0])
+        return results
@@ -0,0 +1,112 @@
+from array import array
+from bisect import bisect_left
+
+
+def _trigrams(text):
+    """Trigrams of a lowercase name, padded so short names and word edges still produce some"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def check_limit(limit):
+    """Reject negative result limits; None means no limit and 0 returns nothing"""
+    if limit is not None and limit < 0:
+        raise ValueError("limit must not be negative")
+
+
+class IconIndex:
+    """Prebuilt lookup structures over the Modus icon names
+
+    - a lowercase -> name dict for O(1) exact validation
+    - a lowercase-sorted array for bisect prefix range queries
+    - a trigram index for substring search and "did you mean" suggestions, with
+      each posting list stored as a flat integer array
+    """
+
+    def __init__(self, icons):
+        self.by_lower = {}
+        for name in icons:
+            lower = name.lower()
+            # Most names are lowercase already; reuse the name instead of storing an equal copy
+            self.by_lower.setdefault(name if lower == name else lower, name)
+        self.sorted_lower = sorted(self.by_lower)
+        self.sorted_names = [self.by_lower[lower] for lower in self.sorted_lower]
+
+        trigram_postings = {}
+        for position, lower in enumerate(self.sorted_lower):
+            for trigram in _trigrams(lower):
+                trigram_postings.setdefault(trigram, []).append(position)
+        self.trigrams = {trigram: array("I", positions) for trigram, positions in trigram_postings.items()}
+
+    def __len__(self):
+        return len(self.sorted_names)
+
+    def resolve(self, name):
+        """Return the canonical icon name for `name` (case-insensitive), or None if it does not exist"""
+        return self.by_lower.get(name.strip().lower())
+
+    def count_prefix(self, prefix):
+        """Number of icons starting with `prefix`"""
+        start, end = self._prefix_range(prefix)
+        return end - start
+
+    def prefix(self, prefix, limit=None):
+        """Icon names starting with `prefix` (case-insensitive), in sorted order"""
+        check_limit(limit)
+        start, end = self._prefix_range(prefix)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.sorted_names[start:end]
+
+    def count_substring(self, text):
+        """Number of icons containing `text` (case-insensitive)"""
+        return sum(1 for _ in self._substring_positions(text))
+
+    def substring(self, text, limit=None):
+        """Icon names containing `text` (case-insensitive), in sorted order
+
+        Candidates are visited in sorted order and the scan stops at `limit`, so a
+        limited query only touches the names before its last match.
+        """
+        check_limit(limit)
+        matches = []
+        if limit == 0:
+            return matches
+        for position in self._substring_positions(text):
+            matches.append(self.sorted_names[position])
+            if limit is not None and len(matches) >= limit:
+                break
+        return matches
+
+    def suggest(self, name, limit=5):
+        """Closest icon names to a misspelled `name`, ranked by trigram similarity"""
+        query = _trigrams(name.strip().lower())
+        shared = {}
+        for trigram in query:
+            for position in self.trigrams.get(trigram, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        scored = []
+        for position, overlap in shared.items():
+            candidate_size = len(_trigrams(self.sorted_lower[position]))
+            similarity = overlap / (len(query) + candidate_size - overlap)
+            scored.append((-similarity, self.sorted_lower[position], position))
+        scored.sort()
+        return [self.sorted_names[position] for _, _, position in scored[:limit]]
+
+    def _substring_positions(self, text):
+        """Sorted positions of the names containing `text`, generated lazily"""
+        text = text.lower()
+        if len(text) < 3:
+            candidates = range(len(self.sorted_lower))
+        else:
+            # Every name containing `text` contains all of its unpadded trigrams, so the
+            # shortest posting list (positions in sorted order) holds every match
+            candidates = min((self.trigrams.get(text[i:i + 3], ()) for i in range(len(text) - 2)), key=len)
+        return (position for position in candidates if text in self.sorted_lower[position])
+
+    def _prefix_range(self, prefix):
+        prefix = prefix.lower()
+        start = bisect_left(self.sorted_lower, prefix)
+        end = bisect_left(self.sorted_lower, prefix + "\U0010ffff", lo=start)
+        return start, end
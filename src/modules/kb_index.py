@@ -0,0 +1,390 @@
+import re
+import sys
+import hashlib
+from typing import NamedTuple
+
+# Line-start tokens the parser cares about: code fences, component headings and prompt headings
+_TOKEN_PATTERN = re.compile(rb'^(?:[ \t]*```|# |## Prompt)', re.MULTILINE)
+
+PROMPT_MARKER = b"## Prompt"
+QUESTION_MARKER = b"**User Question:**"
+ANSWER_MARKER = b"**Agent Answer:**"
+
+# Fence languages of component code; a prompt's `code` is its first block in one of these
+SCRIPT_LANGUAGES = ("tsx", "jsx", "ts", "typescript", "js", "javascript")
+
+# Text fields of an example that callers can project, in response order
+EXAMPLE_FIELDS = ("content", "question", "code", "code_blocks")
+
+# Fields returned when the caller does not pick any (code_blocks repeats `code`)
+DEFAULT_EXAMPLE_FIELDS = ("content", "question", "code")
+
+
+def as_buffer(content):
+    """The UTF-8 bytes a knowledge base is indexed in; records are byte ranges of this buffer
+
+    Text is kept as UTF-8 rather than str: a single emoji makes CPython store a
+    whole str at 4 bytes per character.
+    """
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+
+class CodeBlock(NamedTuple):
+    """A fenced code block inside a prompt section
+
+    `start` and `end` are byte offsets of the code between the fences within the
+    knowledge base buffer `source`; `start_line` and `end_line` are the 1-based
+    lines of the opening and closing fence.
+    """
+    language: str
+    start_line: int
+    end_line: int
+    start: int
+    end: int
+    source: bytes
+
+    @property
+    def code(self):
+        return self.source[self.start:self.end].decode("utf-8")
+
+    def to_dict(self):
+        return {"language": self.language, "code": self.code, "start_line": self.start_line,
+                "end_line": self.end_line}
+
+    def shifted(self, source, offset, lines):
+        """The same block in a new buffer, moved by `offset` bytes and `lines` lines"""
+        return self._replace(start=self.start + offset, end=self.end + offset,
+                             start_line=self.start_line + lines, end_line=self.end_line + lines, source=source)
+
+
+class ExampleRecord(NamedTuple):
+    """A single `## Prompt N` section of a knowledge base file
+
+    The record holds no text of its own: `start` and `end` are byte offsets of the
+    section within the shared knowledge base buffer `source`, and the question and
+    code blocks are byte ranges of the same buffer, so `content`, `question` and
+    `code` are sliced and decoded on access. `code_blocks` holds every fenced block
+    of the section in order; `code` is the first component code block among them.
+    """
+    component: str
+    prompt_number: int
+    start: int
+    end: int
+    question_start: int
+    question_end: int
+    code_blocks: tuple
+    code_index: int
+    source: bytes
+
+    @property
+    def content(self):
+        return self.source[self.start:self.end].decode("utf-8")
+
+    @property
+    def question(self):
+        return self.source[self.question_start:self.question_end].decode("utf-8")
+
+    @property
+    def code(self):
+        return self.code_blocks[self.code_index].code if self.code_index >= 0 else ""
+
+    def to_dict(self, include=DEFAULT_EXAMPLE_FIELDS):
+        """Return the example in the shape the MCP tools return
+        
+        Args:
+            include: The text fields to include, a subset of EXAMPLE_FIELDS. Fields
+                that are not included are never touched, so no strings are decoded for them.
+        """
+        result = {"prompt_number": self.prompt_number}
+        for field in include:
+            if field == "code_blocks":
+                result[field] = [block.to_dict() for block in self.code_blocks]
+            else:
+                result[field] = getattr(self, field)
+        return result
+
+    def shifted(self, source, offset, lines):
+        """The same record in a new buffer, moved by `offset` bytes and `lines` lines"""
+        return self._replace(
+            start=self.start + offset, end=self.end + offset, question_start=self.question_start + offset,
+            question_end=self.question_end + offset, source=source,
+            code_blocks=tuple(block.shifted(source, offset, lines) for block in self.code_blocks),
+        )
+
+
+def _primary_code_index(blocks):
+    """Index of the first component code block, else of the first block of any language, else -1"""
+    for i, block in enumerate(blocks):
+        if block.language in SCRIPT_LANGUAGES:
+            return i
+    return 0 if blocks else -1
+
+
+def _stripped_range(content, start, end):
+    """The byte range left of content[start:end] after stripping surrounding whitespace"""
+    text = content[start:end]
+    stripped = text.strip()
+    if not stripped:
+        return start, start
+    start += text.find(stripped)
+    return start, start + len(stripped)
+
+
+def _question_range(content, start, end):
+    """Byte range of the text between the user question and agent answer markers, empty if missing"""
+    question_start = content.find(QUESTION_MARKER, start, end)
+    if question_start == -1:
+        return start, start
+    answer_start = content.find(ANSWER_MARKER, question_start, end)
+    if answer_start == -1:
+        return start, start
+    return _stripped_range(content, question_start + len(QUESTION_MARKER), answer_start)
+
+
+def tokenize_kb(content, start=0, end=None, first_line=None):
+    """Tokenize a knowledge base, or one span of it, in a single pass
+
+    Only line-start tokens are visited, so the cost is one regex scan of the span
+    however many code blocks it holds. Headings inside code fences are ignored. A
+    fence still open at the end of the span does not produce a block.
+
+    Args:
+        content: The knowledge base buffer (see as_buffer)
+        start: Byte offset to start at
+        end: Byte offset to stop at (default: the end of the buffer)
+        first_line: 1-based line number of `start`, if already known
+
+    Yields:
+        tuple: (kind, position, value) in document order, where kind is "component"
+            (value: the heading text), "prompt" (value: None) or "code" (value: CodeBlock)
+    """
+    end = len(content) if end is None else end
+    line = content.count(b"\n", 0, start) + 1 if first_line is None else first_line
+    counted = start
+    fence = None
+
+    for match in _TOKEN_PATTERN.finditer(content, start, end):
+        token = match.group(0)
+        position = match.start()
+        if not token.endswith(b"```"):
+            if fence is None:
+                kind = "prompt" if token == PROMPT_MARKER else "component"
+                yield kind, position, (_line_text(content, match.end(), end) if kind == "component" else None)
+            continue
+
+        line += content.count(b"\n", counted, position)
+        counted = position
+        line_end = content.find(b"\n", match.end(), end)
+        if line_end == -1:
+            line_end = end
+        if fence is None:
+            language = sys.intern(content[match.end():line_end].strip().lower().decode("utf-8", "replace"))
+            fence = (language, line, line_end + 1)
+            continue
+        language, fence_line, code_start = fence
+        fence = None
+        code_start, code_end = _stripped_range(content, code_start, position)
+        yield "code", position, CodeBlock(language, fence_line, line, code_start, code_end, content)
+
+
+def _line_text(content, start, end):
+    line_end = content.find(b"\n", start, end)
+    return sys.intern(content[start:end if line_end == -1 else line_end].strip().decode("utf-8", "replace"))
+
+
+def _build_example(content, component, prompt_number, start, end, code_blocks):
+    # The question search skips the "## Prompt" marker itself
+    question_start, question_end = _question_range(content, start + len(PROMPT_MARKER), end)
+    return ExampleRecord(
+        component=component,
+        prompt_number=prompt_number,
+        start=start,
+        end=end,
+        question_start=question_start,
+        question_end=question_end,
+        code_blocks=tuple(code_blocks),
+        code_index=_primary_code_index(code_blocks),
+        source=content,
+    )
+
+
+def split_component_sections(content):
+    """Find the span of every `# Component` section in one pass
+
+    Headings are matched as whole lines outside of code fences, so `# ModusWcMenu`
+    never matches the `# ModusWcMenuItem` section. If a component heading appears
+    more than once, the first section wins.
+
+    Args:
+        content: The knowledge base buffer (see as_buffer)
+
+    Returns:
+        list: (component, start, end) tuples in file order, with byte offsets
+    """
+    sections = []
+    seen = set()
+    component = None
+    section_start = None
+    in_fence = False
+
+    for match in _TOKEN_PATTERN.finditer(content):
+        token = match.group(0)
+        if token.endswith(b"```"):
+            in_fence = not in_fence
+            continue
+        if in_fence or token != b"# ":
+            continue
+
+        position = match.start()
+        if component is not None:
+            # A component section ends just before the newline preceding the next heading
+            sections.append((component, section_start, position - 1))
+        name = _line_text(content, position + 2, len(content))
+        component = None if name in seen else name
+        section_start = position
+        seen.add(name)
+
+    if component is not None:
+        sections.append((component, section_start, len(content)))
+
+    return sections
+
+
+def split_heading_sections(content, level):
+    """Find the span of every heading of exactly `level` (1 for `#`, 2 for `##`, ...)
+
+    Like split_component_sections, headings inside code fences are ignored.
+    Text before the first heading is not part of any section.
+
+    Args:
+        content: Markdown text
+        level: The heading level to split at
+
+    Returns:
+        list: (heading, start, end) tuples in file order
+    """
+    heading_pattern = re.compile(r'^(?:[ \t]*```|#{%d} )' % level, re.MULTILINE)
+    sections = []
+    heading = None
+    section_start = None
+    in_fence = False
+
+    for match in heading_pattern.finditer(content):
+        token = match.group(0)
+        if token.endswith("```"):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+
+        position = match.start()
+        if heading is not None:
+            sections.append((heading, section_start, position))
+        line_end = content.find("\n", position)
+        if line_end == -1:
+            line_end = len(content)
+        heading = content[match.end():line_end].strip()
+        section_start = position
+
+    if heading is not None:
+        sections.append((heading, section_start, len(content)))
+
+    return sections
+
+
+def parse_component_section(content, component, start, end, first_line=None):
+    """Build the ExampleRecord tuple for one `# Component` section
+
+    Args:
+        content: The knowledge base buffer (see as_buffer)
+        component: The component the section belongs to
+        start: Byte offset of the `# Component` heading
+        end: Byte offset where the section ends
+        first_line: 1-based line number of `start`, if already known
+
+    Returns:
+        tuple: The section's ExampleRecord entries, in file order
+    """
+    examples = []
+    prompt_start = None
+    code_blocks = []
+
+    for kind, position, value in tokenize_kb(content, start, end, first_line):
+        if kind == "code":
+            # Blocks before the first prompt belong to no example
+            if prompt_start is not None:
+                code_blocks.append(value)
+        elif kind == "prompt":
+            if prompt_start is not None:
+                examples.append(_build_example(content, component, len(examples) + 1, prompt_start, position,
+                                               code_blocks))
+            prompt_start = position
+            code_blocks = []
+
+    if prompt_start is not None:
+        examples.append(_build_example(content, component, len(examples) + 1, prompt_start, end, code_blocks))
+
+    return tuple(examples)
+
+
+def iter_code_blocks(content):
+    """Every fenced code block of a knowledge base with the prompt it belongs to, in one pass
+
+    Args:
+        content: The knowledge base, as text or as its UTF-8 buffer
+
+    Yields:
+        tuple: (component, prompt_number, CodeBlock); prompt_number is None for blocks
+            between a component heading and its first prompt, and component is None
+            for blocks before the first component heading
+    """
+    component = None
+    prompt_number = None
+    for kind, _, value in tokenize_kb(as_buffer(content)):
+        if kind == "component":
+            component, prompt_number = value, None
+        elif kind == "prompt":
+            prompt_number = (prompt_number or 0) + 1
+        else:
+            yield component, prompt_number, value
+
+
+def section_hash(content, start, end):
+    """Content hash of one component section, used to skip re-indexing unchanged sections"""
+    return hashlib.blake2b(content[start:end], digest_size=16).hexdigest()
+
+
+def parse_kb_examples(content, previous_sections=None):
+    """Index every `# Component` / `## Prompt N` section of a knowledge base
+
+    Args:
+        content: The knowledge base, as text or as its UTF-8 buffer; the records reference the buffer
+        previous_sections: Optional section cache returned by an earlier call; sections
+            whose content hash is unchanged reuse their records instead of being re-parsed
+
+    Returns:
+        tuple: (index, sections) where index maps component name to a tuple of
+            ExampleRecord and sections maps content hash to (start, first line, records) for reuse
+    """
+    content = as_buffer(content)
+    previous_sections = previous_sections or {}
+    index = {}
+    sections = {}
+    line = 1
+    counted = 0
+
+    for component, start, end in split_component_sections(content):
+        line += content.count(b"\n", counted, start)
+        counted = start
+        digest = section_hash(content, start, end)
+        cached = previous_sections.get(digest)
+        if cached is not None:
+            # Unchanged section: move the cached records into the new buffer, at the section's new position
+            old_start, old_line, records = cached
+            records = tuple(record.shifted(content, start - old_start, line - old_line) for record in records)
+        else:
+            records = parse_component_section(content, component, start, end, line)
+        index[component] = records
+        sections[digest] = (start, line, records)
+
+    return index, sections
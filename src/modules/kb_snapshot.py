@@ -0,0 +1,65 @@
+import os
+from typing import NamedTuple
+
+# Framework whose examples are returned when none is requested, or as the fallback
+DEFAULT_FRAMEWORK = "react"
+
+
+def file_stamp(path):
+    """Return an (mtime, inode, size) stamp for change detection, or None if the file is missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+
+class KnowledgeBaseSnapshot(NamedTuple):
+    """Immutable view of every parsed Knowledge Base file
+
+    A snapshot is never modified after it is built. Reloads build a new snapshot
+    (reusing unchanged parts of the old one) and swap the registry's reference in
+    a single assignment, so a tool call that holds a snapshot always sees a
+    consistent set of components, icons and examples.
+    """
+    generation: int
+    stamps: dict
+    hashes: dict
+    components: dict
+    component_names: tuple
+    icons: tuple
+    icon_index: object
+    # Framework -> UTF-8 buffer of its knowledge base, shared by that framework's ExampleRecords
+    kb_contents: dict
+    examples: dict
+    kb_sections: dict
+    docs: dict
+    search_index: object
+    component_graph: object
+    example_vectors: object
+    snippet_validator: object
+
+    def get_component(self, component_name):
+        """Get the ComponentRecord for a component, or None if unknown"""
+        return self.components.get(component_name)
+
+    @property
+    def kb_content(self):
+        """Full markdown text of the React knowledge base, decoded from its UTF-8 buffer"""
+        return self.kb_contents.get(DEFAULT_FRAMEWORK, b"").decode("utf-8")
+
+    def get_examples(self, component_name, framework=DEFAULT_FRAMEWORK):
+        """Get the ExampleRecord tuple for a component in one framework's knowledge base"""
+        return self.examples.get(framework, {}).get(component_name, ())
+
+    def resolve_examples(self, component_name, framework=None):
+        """Get a component's examples for a framework, falling back to the default framework
+
+        Returns:
+            tuple: (examples, framework the examples are for, whether the fallback was used)
+        """
+        framework = (framework or DEFAULT_FRAMEWORK).lower()
+        examples = self.get_examples(component_name, framework)
+        if examples or framework == DEFAULT_FRAMEWORK:
+            return examples, framework, False
+        return self.get_examples(component_name, DEFAULT_FRAMEWORK), DEFAULT_FRAMEWORK, True
@@ -0,0 +1,40 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class KnowledgeBaseWatcher:
+    """Background thread that polls the Knowledge Base files and hot-reloads the registry
+
+    Change detection is mtime/inode/size polling, so no external services or
+    platform-specific file notification APIs are needed.
+    """
+
+    def __init__(self, registry, interval=2.0):
+        self.registry = registry
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start polling in a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="kb-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling and wait for the thread to exit"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.registry.reload_if_changed()
+            except Exception as e:
+                logger.exception("Error reloading knowledge base: %s", e)
@@ -0,0 +1,140 @@
+import json
+import time
+import functools
+import threading
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class _ToolStats:
+    __slots__ = ("calls", "errors", "latency_sum", "bucket_counts", "payload_bytes", "max_payload_bytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.payload_bytes = 0
+        self.max_payload_bytes = 0
+
+
+class Metrics:
+    """In-process counters for tool calls and caches
+
+    Recording is a few integer updates under a lock, cheap enough for every call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools = {}
+        self._caches = {}
+        self.started_at = time.time()
+
+    def record_call(self, tool, seconds, payload_bytes, error=False):
+        """Record one tool call's latency, response size and outcome"""
+        bucket = len(LATENCY_BUCKETS)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                bucket = i
+                break
+        with self._lock:
+            stats = self._tools.get(tool)
+            if stats is None:
+                stats = self._tools[tool] = _ToolStats()
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.latency_sum += seconds
+            stats.bucket_counts[bucket] += 1
+            stats.payload_bytes += payload_bytes
+            stats.max_payload_bytes = max(stats.max_payload_bytes, payload_bytes)
+
+    def record_cache(self, cache, hit):
+        """Record a hit or miss for a named cache"""
+        with self._lock:
+            counts = self._caches.setdefault(cache, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def instrument(self, func):
+        """Decorator for async tool/resource handlers that records latency, payload size and errors
+
+        The handler's result is serialized to JSON here, once, and returned as text; FastMCP
+        passes strings through unchanged, so the payload is measured without serializing twice.
+        """
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            error = True
+            payload = ""
+            try:
+                result = await func(*args, **kwargs)
+                payload = result if isinstance(result, str) else json.dumps(result)
+                error = isinstance(result, dict) and result.get("success") is False
+                return payload
+            finally:
+                self.record_call(func.__name__, time.perf_counter() - start, len(payload.encode("utf-8")), error)
+        return wrapper
+
+    def snapshot(self):
+        """Get all counters as a JSON-friendly dict"""
+        with self._lock:
+            tools = {}
+            for name, stats in sorted(self._tools.items()):
+                tools[name] = {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "mean_latency_ms": round(stats.latency_sum / stats.calls * 1000, 4) if stats.calls else 0.0,
+                    "latency_histogram_ms": {
+                        ("+Inf" if i == len(LATENCY_BUCKETS) else f"<={LATENCY_BUCKETS[i] * 1000:g}"): count
+                        for i, count in enumerate(stats.bucket_counts) if count
+                    },
+                    "payload_bytes_total": stats.payload_bytes,
+                    "payload_bytes_mean": stats.payload_bytes // stats.calls if stats.calls else 0,
+                    "payload_bytes_max": stats.max_payload_bytes,
+                }
+            caches = {
+                name: {"hits": hits, "misses": misses,
+                       "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0}
+                for name, (hits, misses) in sorted(self._caches.items())
+            }
+        return {"uptime_seconds": round(time.time() - self.started_at, 1), "tools": tools, "caches": caches}
+
+    def to_prometheus(self):
+        """Render the counters in the Prometheus text exposition format"""
+        lines = [
+            "# HELP modus_tool_calls_total Tool calls handled.",
+            "# TYPE modus_tool_calls_total counter",
+        ]
+        with self._lock:
+            tools = sorted(self._tools.items())
+            caches = sorted(self._caches.items())
+            for name, stats in tools:
+                lines.append(f'modus_tool_calls_total{{tool="{name}"}} {stats.calls}')
+            lines += ["# HELP modus_tool_errors_total Tool calls that returned an error.",
+                      "# TYPE modus_tool_errors_total counter"]
+            for name, stats in tools:
+                lines.append(f'modus_tool_errors_total{{tool="{name}"}} {stats.errors}')
+            lines += ["# HELP modus_tool_latency_seconds Tool call latency.",
+                      "# TYPE modus_tool_latency_seconds histogram"]
+            for name, stats in tools:
+                cumulative = 0
+                for i, count in enumerate(stats.bucket_counts):
+                    cumulative += count
+                    bound = "+Inf" if i == len(LATENCY_BUCKETS) else f"{LATENCY_BUCKETS[i]:g}"
+                    lines.append(f'modus_tool_latency_seconds_bucket{{tool="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'modus_tool_latency_seconds_sum{{tool="{name}"}} {stats.latency_sum:.6f}')
+                lines.append(f'modus_tool_latency_seconds_count{{tool="{name}"}} {stats.calls}')
+            lines += ["# HELP modus_tool_payload_bytes_total Serialized response bytes.",
+                      "# TYPE modus_tool_payload_bytes_total counter"]
+            for name, stats in tools:
+                lines.append(f'modus_tool_payload_bytes_total{{tool="{name}"}} {stats.payload_bytes}')
+            lines += ["# HELP modus_cache_requests_total Cache lookups by result.",
+                      "# TYPE modus_cache_requests_total counter"]
+            for name, (hits, misses) in caches:
+                lines.append(f'modus_cache_requests_total{{cache="{name}",result="hit"}} {hits}')
+                lines.append(f'modus_cache_requests_total{{cache="{name}",result="miss"}} {misses}')
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide metrics shared by the server and the registry
+metrics = Metrics()
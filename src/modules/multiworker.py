@@ -0,0 +1,179 @@
+import gc
+import os
+import signal
+import shutil
+import socket
+import logging
+import tempfile
+import multiprocessing
+
+import httpx
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+# Response headers recomputed when a forwarded response is relayed
+_HOP_BY_HOP_HEADERS = {"connection", "content-length", "keep-alive", "transfer-encoding"}
+
+
+def worker_message_path(worker_id):
+    """Message endpoint advertised to the SSE sessions of one worker, e.g. /messages/2/"""
+    return f"/messages/{worker_id}/"
+
+
+class SessionAffinityRouter:
+    """ASGI wrapper that delivers each MCP session's messages to the worker holding its SSE stream
+
+    An SSE session is two HTTP connections: the long-lived GET /sse stream and the
+    POSTs to the message endpoint. With several workers accepting on one socket,
+    the kernel may hand those POSTs to any worker. Each worker advertises a message
+    endpoint containing its own id, and a worker that receives another worker's
+    message relays it over that worker's private unix socket. The SSE stream, and
+    with it all tool work and response bytes, stays on the owning worker.
+    """
+
+    def __init__(self, app, worker_id, socket_paths):
+        """
+        Args:
+            app: The worker's ASGI application
+            worker_id: Index of this worker
+            socket_paths: Private unix socket path of every worker, by worker id
+        """
+        self.app = app
+        self.worker_id = worker_id
+        self.socket_paths = socket_paths
+        self._clients = {}
+
+    async def __call__(self, scope, receive, send):
+        owner = self._owner(scope)
+        if owner is None or owner == self.worker_id:
+            await self.app(scope, receive, send)
+        else:
+            await self._forward(owner, scope, receive, send)
+
+    def _owner(self, scope):
+        if scope["type"] != "http":
+            return None
+        parts = scope["path"].split("/")
+        if len(parts) > 2 and parts[1] == "messages" and parts[2].isdigit():
+            owner = int(parts[2])
+            if owner < len(self.socket_paths):
+                return owner
+        return None
+
+    def _client(self, owner):
+        client = self._clients.get(owner)
+        if client is None:
+            transport = httpx.AsyncHTTPTransport(uds=self.socket_paths[owner])
+            client = self._clients[owner] = httpx.AsyncClient(transport=transport, base_url="http://worker")
+        return client
+
+    async def _forward(self, owner, scope, receive, send):
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        target = scope["path"]
+        if scope.get("query_string"):
+            target += "?" + scope["query_string"].decode("latin-1")
+        headers = [(name.decode("latin-1"), value.decode("latin-1")) for name, value in scope["headers"]
+                   if name.decode("latin-1").lower() not in _HOP_BY_HOP_HEADERS | {"host"}]
+        try:
+            response = await self._client(owner).request(scope["method"], target, headers=headers, content=body)
+            status, content = response.status_code, response.content
+            response_headers = [(name.encode("latin-1"), value.encode("latin-1"))
+                                for name, value in response.headers.items()
+                                if name.lower() not in _HOP_BY_HOP_HEADERS]
+        except httpx.HTTPError as e:
+            logger.error("Error forwarding message to worker %d: %s", owner, e)
+            status, content, response_headers = 502, b"Worker unavailable", []
+
+        response_headers.append((b"content-length", str(len(content)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": content})
+
+
+def _run_worker(build_app, worker_id, listener, private_socket, socket_paths, log_level):
+    app = SessionAffinityRouter(build_app(worker_id), worker_id, socket_paths)
+    config = uvicorn.Config(app, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[listener, private_socket])
+
+
+def serve_workers(build_app, host, port, workers, log_level="info"):
+    """Run `workers` forked uvicorn processes that accept on one shared listening socket
+
+    Everything loaded in this process before the call (the Knowledge Base snapshot
+    and its indexes) is inherited copy-on-write by every worker. The objects are
+    moved out of the garbage collector's reach first, so collections in the workers
+    do not write to, and thereby un-share, those pages.
+
+    Workers that exit are restarted with the same id. Requires os.fork (Linux, macOS).
+
+    Args:
+        build_app: Callable taking a worker id and returning that worker's ASGI app;
+            called in the worker after the fork
+        host: Bind address
+        port: Bind port
+        workers: Number of worker processes
+        log_level: uvicorn log level
+    """
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Multiple workers need os.fork; run a single worker on this platform")
+
+    listener = socket.create_server((host, port), backlog=2048)
+    socket_dir = tempfile.mkdtemp(prefix="modus-mcp-")
+    socket_paths = [os.path.join(socket_dir, f"worker-{worker_id}.sock") for worker_id in range(workers)]
+    private_sockets = []
+    for path in socket_paths:
+        private_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        private_socket.bind(path)
+        private_socket.listen(512)
+        private_sockets.append(private_socket)
+
+    gc.collect()
+    gc.freeze()
+    context = multiprocessing.get_context("fork")
+
+    def start(worker_id):
+        process = context.Process(
+            target=_run_worker, name=f"modus-mcp-worker-{worker_id}",
+            args=(build_app, worker_id, listener, private_sockets[worker_id], socket_paths, log_level)
+        )
+        process.start()
+        return process
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    previous_handler = signal.signal(signal.SIGTERM, stop)
+    processes = [start(worker_id) for worker_id in range(workers)]
+    logger.info("Started %d workers on %s:%d (pids %s)", workers, host, port,
+                ", ".join(str(process.pid) for process in processes))
+    try:
+        while True:
+            for worker_id, process in enumerate(processes):
+                process.join(0.5)
+                if process.exitcode is not None:
+                    logger.error("Worker %d (pid %d) exited with code %s; restarting", worker_id, process.pid,
+                                 process.exitcode)
+                    processes[worker_id] = start(worker_id)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(5)
+            if process.is_alive():
+                # uvicorn waits for open SSE streams on SIGTERM; don't hang on them
+                process.kill()
+                process.join()
+        listener.close()
+        for private_socket in private_sockets:
+            private_socket.close()
+        shutil.rmtree(socket_dir, ignore_errors=True)
@@ -0,0 +1,107 @@
+import json
+import inspect
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+
+from modules.metrics import metrics
+
+
+def content_etag(payload):
+    """Short content hash of a serialized payload"""
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def unchanged_response(etag):
+    """The reply sent instead of a payload the client already has"""
+    return json.dumps({"success": True, "unchanged": True, "etag": etag})
+
+
+class ResponseCache:
+    """LRU cache of serialized tool/resource responses with content-hash ETags
+
+    Entries are keyed by (handler name, arguments, snapshot generation), so a
+    knowledge base reload naturally invalidates every cached response without
+    any explicit flushing; stale generations simply age out of the LRU.
+    """
+
+    def __init__(self, version_func, maxsize=512, deliveries=None):
+        """
+        Args:
+            version_func: Callable returning the current snapshot generation
+            maxsize: Maximum number of cached responses
+            deliveries: Optional SessionDeliveries deciding what each session is sent
+        """
+        self.version_func = version_func
+        self.maxsize = maxsize
+        self.deliveries = deliveries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _payload(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def cached(self, func):
+        """Decorator for async handlers returning a JSON object
+
+        Serves repeated calls from the cache, adds an `etag` field (a hash of the rest
+        of the payload) to every response, and honours an `if_none_match` keyword: when
+        it equals the current ETag, a small `unchanged` reply is returned instead of the
+        payload. Error responses (`"success": false`) are not cached.
+
+        Handlers that declare a `force_full` parameter are also session-aware when the
+        cache has `deliveries`: a session repeating a call gets a reference to, or the
+        changed fields of, the response it already has unless it passes force_full.
+        """
+        session_aware = "force_full" in inspect.signature(func).parameters
+
+        @functools.wraps(func)
+        async def wrapper(*args, if_none_match=None, force_full=False, **kwargs):
+            call = (func.__name__, json.dumps([args, kwargs], sort_keys=True, default=str))
+            generation = self.version_func()
+            key = call + (generation,)
+            entry = self.get(key)
+            metrics.record_cache("responses", entry is not None)
+            if entry is None:
+                result = await func(*args, **kwargs)
+                if isinstance(result, dict) and result.get("success") is False:
+                    return result
+                body = result if isinstance(result, str) else json.dumps(result)
+                etag = content_etag(body)
+                # Splice the ETag into the serialized object instead of serializing it again
+                payload = f'{body[:-1]}, "etag": "{etag}"}}' if body.endswith("}") and body != "{}" else body
+                entry = (payload, etag)
+                self.put(key, entry)
+
+            payload, etag = entry
+            if if_none_match and if_none_match == etag:
+                return unchanged_response(etag)
+            if session_aware and self.deliveries is not None:
+                return self.deliveries.respond(call, generation, payload, etag, force_full,
+                                               lambda old_generation: self._payload(call + (old_generation,)))
+            return payload
+        return wrapper
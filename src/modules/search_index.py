@@ -0,0 +1,299 @@
+import os
+import re
+import math
+import heapq
+import pickle
+from array import array
+from typing import NamedTuple
+
+from modules.kb_index import split_heading_sections
+from modules.kb_snapshot import DEFAULT_FRAMEWORK
+
+# Bump whenever the document set, scoring or storage layout changes so stale on-disk indexes are rebuilt
+INDEX_FORMAT_VERSION = 4
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_BOOST = 3
+SNIPPET_RADIUS = 80
+
+_WORD_PATTERN = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i in is it of on or that the this to use "
+    "using what when which with you your".split()
+)
+
+
+def tokenize(text):
+    """Lowercase word tokens, also splitting camelCase / PascalCase identifiers into their parts
+
+    `ModusWcTextInput` yields `moduswctextinput`, `modus`, `wc`, `text` and `input`, so
+    both the exact component name and plain-language queries match.
+    """
+    tokens = []
+    for word in _WORD_PATTERN.findall(text):
+        lower = word.lower()
+        if lower not in _STOPWORDS:
+            tokens.append(lower)
+        parts = _CAMEL_PATTERN.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts if part.lower() not in _STOPWORDS)
+    return tokens
+
+
+class SearchDocument(NamedTuple):
+    """One searchable unit: a component, a KB prompt example or a documentation section"""
+    kind: str
+    title: str
+    component: str
+    ref: str
+    text: str
+
+
+def build_search_documents(components, examples, docs):
+    """Turn the parsed Knowledge Base into SearchDocument entries
+
+    Args:
+        components: Mapping of component name to ComponentRecord
+        examples: Mapping of framework to a mapping of component name to a tuple of ExampleRecord
+        docs: Mapping of document name to (markdown text, heading level to split at)
+
+    Returns:
+        list: The documents to index
+    """
+    documents = []
+    for name, record in components.items():
+        member_names = " ".join(
+            member.name or "" for member in record.properties + record.events + record.methods
+        )
+        documents.append(SearchDocument(
+            kind="component",
+            title=name,
+            component=name,
+            ref=name,
+            text=f"{record.description}\n{member_names}"
+        ))
+
+    for framework, framework_examples in examples.items():
+        # React refs keep their original form; other frameworks are qualified
+        ref_prefix = "" if framework == DEFAULT_FRAMEWORK else f"{framework}-"
+        title_suffix = "" if framework == DEFAULT_FRAMEWORK else f" ({framework})"
+        for name, records in framework_examples.items():
+            for example in records:
+                documents.append(SearchDocument(
+                    kind="example",
+                    title=f"{name} Prompt {example.prompt_number}{title_suffix}",
+                    component=name,
+                    ref=f"{name}#{ref_prefix}prompt-{example.prompt_number}",
+                    text="\n".join((example.question, *(block.code for block in example.code_blocks)))
+                ))
+
+    for doc_name, (content, level) in docs.items():
+        for heading, start, end in split_heading_sections(content, level):
+            documents.append(SearchDocument(
+                kind="doc",
+                title=heading,
+                component="",
+                ref=f"{doc_name}#{heading}",
+                text=content[start:end]
+            ))
+
+    return documents
+
+
+class PostingLists:
+    """Read-only term -> [(doc_id, weight)] mapping stored as three flat arrays
+
+    The postings of every term are concatenated into one doc id array and one
+    weight array, and each term maps to its slice (compressed sparse columns).
+    That is 12 bytes per posting, instead of a tuple, an int and a float object.
+    """
+    __slots__ = ("columns", "starts", "doc_ids", "weights")
+
+    def __init__(self, postings):
+        """
+        Args:
+            postings: Mapping of term to a (doc ids, weights) pair of parallel lists
+        """
+        self.columns = {}
+        self.starts = array("I", [0])
+        self.doc_ids = array("I")
+        self.weights = array("d")
+        for column, (term, (doc_ids, weights)) in enumerate(postings.items()):
+            self.columns[term] = column
+            self.doc_ids.extend(doc_ids)
+            self.weights.extend(weights)
+            self.starts.append(len(self.doc_ids))
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __contains__(self, term):
+        return term in self.columns
+
+    def get(self, term, default=()):
+        """The (doc_id, weight) pairs of a term, or `default` if it occurs in no document"""
+        column = self.columns.get(term)
+        if column is None:
+            return default
+        start, end = self.starts[column], self.starts[column + 1]
+        return zip(self.doc_ids[start:end], self.weights[start:end])
+
+
+def _term_counts(document):
+    counts = {}
+    for token in tokenize(document.title) * TITLE_BOOST + tokenize(document.text):
+        counts[token] = counts.get(token, 0) + 1
+    return counts
+
+
+class SearchIndex:
+    """Inverted index with precomputed BM25 weights
+
+    Each posting stores the final BM25 term weight for its document, so a query
+    is a handful of dict lookups and additions followed by a top-k heap selection.
+    The per-document term counts are kept as well, as posting column ids: BM25 weights
+    depend on corpus-wide statistics, so an edit reweights every posting, but only
+    changed documents are tokenized again.
+    """
+
+    def __init__(self, documents, postings, source_hash, term_counts=()):
+        self.documents = documents
+        self.postings = postings
+        self.source_hash = source_hash
+        self.term_counts = term_counts
+
+    @classmethod
+    def build(cls, documents, source_hash, previous=None):
+        """Build the index for a list of SearchDocument
+
+        Args:
+            documents: The documents to index
+            source_hash: Content hash of the sources the documents were built from
+            previous: An earlier SearchIndex whose term counts are reused for unchanged documents
+
+        Returns:
+            SearchIndex: The built index
+        """
+        known = {}
+        if previous is not None:
+            known = dict(zip(previous.documents, previous.term_counts))
+            terms = tuple(previous.postings.columns)
+        term_frequencies = []
+        for document in documents:
+            stored = known.get(document)
+            if stored is None:
+                term_frequencies.append(_term_counts(document))
+            else:
+                columns, counts = stored
+                term_frequencies.append(dict(zip(map(terms.__getitem__, columns), counts)))
+
+        doc_count = len(documents)
+        lengths = [sum(counts.values()) for counts in term_frequencies]
+        average_length = (sum(lengths) / doc_count) if doc_count else 0.0
+
+        document_frequency = {}
+        for counts in term_frequencies:
+            for token in counts:
+                document_frequency[token] = document_frequency.get(token, 0) + 1
+        idf = {token: _idf(doc_count, df) for token, df in document_frequency.items()}
+
+        # Per term, parallel lists of doc ids and weights
+        postings = {token: ([], []) for token in document_frequency}
+        for doc_id, counts in enumerate(term_frequencies):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_id] / average_length) if average_length else BM25_K1
+            for token, tf in counts.items():
+                doc_ids, weights = postings[token]
+                doc_ids.append(doc_id)
+                weights.append(idf[token] * tf * (BM25_K1 + 1) / (tf + norm))
+
+        # Term counts are kept as (column ids, counts) arrays, not dicts: a fraction of the memory
+        column_of = {token: column for column, token in enumerate(postings)}
+        term_counts = tuple(
+            (array("I", map(column_of.__getitem__, counts)), array("I", counts.values()))
+            for counts in term_frequencies
+        )
+        return cls(tuple(documents), PostingLists(postings), source_hash, term_counts)
+
+    def search(self, query, k=10, kind=None):
+        """Return the top-k documents for a query, best first
+
+        Args:
+            query: Free-text query
+            k: Maximum number of hits to return
+            kind: Optional document kind filter ("component", "example" or "doc")
+
+        Returns:
+            list: Hit dicts with kind, title, component, ref, score and snippet
+        """
+        terms = set(tokenize(query))
+        scores = {}
+        for term in terms:
+            for doc_id, weight in self.postings.get(term, ()):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+
+        if kind:
+            scores = {doc_id: score for doc_id, score in scores.items() if self.documents[doc_id].kind == kind}
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        hits = []
+        for doc_id, score in top:
+            document = self.documents[doc_id]
+            hits.append({
+                "kind": document.kind,
+                "title": document.title,
+                "component": document.component,
+                "ref": document.ref,
+                "score": round(score, 4),
+                "snippet": _snippet(document.text, terms)
+            })
+        return hits
+
+    def save(self, path):
+        """Serialize the index so later processes can skip the build"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Per-process temp name: several worker processes may save at once
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            # The header is a separate pickle, so a stale index is rejected without reading the rest
+            pickle.dump((INDEX_FORMAT_VERSION, self.source_hash), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump((self.documents, self.postings, self.term_counts), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path, source_hash):
+        """Load a serialized index, or return None if it is missing or was built from other sources"""
+        try:
+            with open(path, 'rb') as f:
+                if pickle.load(f) != (INDEX_FORMAT_VERSION, source_hash):
+                    return None
+                documents, postings, term_counts = pickle.load(f)
+        except Exception:
+            return None
+        return cls(documents, postings, source_hash, term_counts)
+
+
+def _idf(doc_count, df):
+    """BM25 inverse document frequency, floored at a small positive value"""
+    return max(math.log((doc_count - df + 0.5) / (df + 0.5) + 1), 1e-6)
+
+
+def _snippet(text, terms):
+    """Return a short window of `text` around the first occurrence of any query term"""
+    lower = text.lower()
+    first = -1
+    for term in terms:
+        position = lower.find(term)
+        if position != -1 and (first == -1 or position < first):
+            first = position
+    if first == -1:
+        first = 0
+    start = max(first - SNIPPET_RADIUS, 0)
+    end = min(first + SNIPPET_RADIUS, len(text))
+    snippet = " ".join(text[start:end].split())
+    if start > 0:
+        snippet = "..." + snippet
+    if end < len(text):
+        snippet = snippet + "..."
+    return snippet
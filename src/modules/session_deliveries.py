@@ -0,0 +1,163 @@
+import json
+import threading
+import weakref
+from collections import OrderedDict
+
+from modules.metrics import metrics
+
+# Reply kinds, in the order they are reported
+DELIVERY_KINDS = ("full", "reference", "delta")
+
+_MISSING = object()
+
+
+def reference_response(etag):
+    """The reply sent instead of a payload this session has already received"""
+    return json.dumps({
+        "success": True, "unchanged": True, "already_sent": True, "etag": etag,
+        "note": "Same as the response with this etag sent earlier in this session; pass force_full=true to resend it",
+    })
+
+
+def field_delta(old_payload, payload, old_etag, etag):
+    """A reply carrying only the top-level fields of `payload` that differ from `old_payload`
+
+    Returns:
+        str: The serialized delta, or None if either payload is not a JSON object
+    """
+    old = json.loads(old_payload)
+    new = json.loads(payload)
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return None
+    changed = {field: value for field, value in new.items()
+               if field != "etag" and old.get(field, _MISSING) != value}
+    removed = [field for field in old if field not in new]
+    return json.dumps({"success": True, "delta": True, "base_etag": old_etag, "etag": etag,
+                       "changed": changed, "removed": removed})
+
+
+class _SessionState:
+    __slots__ = ("number", "delivered", "counts", "full_bytes", "sent_bytes")
+
+    def __init__(self, number):
+        self.number = number
+        # (handler, arguments) -> (etag, snapshot generation) of the last payload sent, least recent first
+        self.delivered = OrderedDict()
+        self.counts = dict.fromkeys(DELIVERY_KINDS, 0)
+        self.full_bytes = 0
+        self.sent_bytes = 0
+
+
+class SessionDeliveries:
+    """Remembers which response versions each MCP session has already received
+
+    A repeated call whose response is unchanged gets a small reference to the
+    ETag sent earlier instead of the payload. If the knowledge base was reloaded
+    since, only the top-level fields that changed are sent, diffed against the
+    response of the generation the session last received (while the response
+    cache still holds it). Sessions are held by weak reference, so their state
+    goes away with them; what they saved stays in the totals.
+    """
+
+    def __init__(self, session_func, max_entries=256):
+        """
+        Args:
+            session_func: Callable returning the MCP session of the current request, or None
+            max_entries: Deliveries remembered per session; older ones are sent in full again
+        """
+        self.session_func = session_func
+        self.max_entries = max_entries
+        self._sessions = weakref.WeakKeyDictionary()
+        self._sessions_seen = 0
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(DELIVERY_KINDS, 0)
+        self._full_bytes = 0
+        self._sent_bytes = 0
+
+    def respond(self, call, generation, payload, etag, force_full=False, previous_payload=None):
+        """The reply to send the current session for a serialized response
+
+        Args:
+            call: Hashable identity of the call, without the snapshot generation
+            generation: Snapshot generation the payload was built from
+            payload: The full serialized response
+            etag: Content hash of the payload
+            force_full: Send the full payload even if the session already has it
+            previous_payload: Callable returning the cached payload of the same call
+                for an earlier generation, or None once it has been evicted
+
+        Returns:
+            str: The payload, a reference to it or a delta against the last one sent
+        """
+        session = self.session_func()
+        if session is None:
+            return payload
+        with self._lock:
+            state = self._sessions.get(session)
+            if state is None:
+                self._sessions_seen += 1
+                state = self._sessions[session] = _SessionState(self._sessions_seen)
+            previous = state.delivered.pop(call, None)
+            state.delivered[call] = (etag, generation)
+            if len(state.delivered) > self.max_entries:
+                state.delivered.popitem(last=False)
+
+        kind, reply = "full", payload
+        if previous is not None and not force_full:
+            previous_etag, previous_generation = previous
+            if previous_etag == etag:
+                # Also the case after a reload that left this response as it was; tiny payloads are just resent
+                reference = reference_response(etag)
+                if len(reference) < len(payload):
+                    kind, reply = "reference", reference
+            elif previous_payload is not None:
+                old_payload = previous_payload(previous_generation)
+                delta = field_delta(old_payload, payload, previous_etag, etag) if old_payload else None
+                if delta is not None and len(delta) < len(payload):
+                    kind, reply = "delta", delta
+
+        full_bytes = len(payload.encode("utf-8"))
+        sent_bytes = full_bytes if reply is payload else len(reply.encode("utf-8"))
+        with self._lock:
+            state.counts[kind] += 1
+            state.full_bytes += full_bytes
+            state.sent_bytes += sent_bytes
+            self._counts[kind] += 1
+            self._full_bytes += full_bytes
+            self._sent_bytes += sent_bytes
+        metrics.record_cache("session_deliveries", kind != "full")
+        return reply
+
+    def snapshot(self):
+        """Get bytes saved in total and per active session as a JSON-friendly dict"""
+        with self._lock:
+            sessions = [
+                {"session": state.number, **state.counts, "bytes_full": state.full_bytes,
+                 "bytes_sent": state.sent_bytes, "bytes_saved": state.full_bytes - state.sent_bytes}
+                for state in sorted(self._sessions.values(), key=lambda state: state.number)
+            ]
+            seen = self._sessions_seen
+            saved = self._full_bytes - self._sent_bytes
+            return {
+                "sessions_seen": seen,
+                "active_sessions": len(sessions),
+                "responses": dict(self._counts),
+                "bytes_full": self._full_bytes,
+                "bytes_sent": self._sent_bytes,
+                "bytes_saved": saved,
+                "bytes_saved_per_session": saved // seen if seen else 0,
+                "sessions": sessions,
+            }
+
+    def to_prometheus(self):
+        """Render the totals in the Prometheus text exposition format"""
+        with self._lock:
+            counts = dict(self._counts)
+            full_bytes, sent_bytes = self._full_bytes, self._sent_bytes
+        lines = ["# HELP modus_session_responses_total Session-aware responses by what was sent.",
+                 "# TYPE modus_session_responses_total counter"]
+        lines += [f'modus_session_responses_total{{kind="{kind}"}} {counts[kind]}' for kind in DELIVERY_KINDS]
+        lines += ["# HELP modus_session_bytes_saved_total Response bytes not resent to sessions that had them.",
+                  "# TYPE modus_session_bytes_saved_total counter",
+                  f"modus_session_bytes_saved_total {full_bytes - sent_bytes}"]
+        return "\n".join(lines) + "\n"
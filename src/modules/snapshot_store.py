@@ -0,0 +1,69 @@
+import os
+import pickle
+import hashlib
+
+from modules.kb_snapshot import KnowledgeBaseSnapshot, file_stamp
+
+# Bump whenever KnowledgeBaseSnapshot or any record type stored in it changes shape
+SNAPSHOT_FORMAT_VERSION = 9
+
+
+def _file_hash(path):
+    """Content hash of a file, matching ComponentRegistry._read_source"""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def save_snapshot(snapshot, path):
+    """Write a compiled snapshot (components, icons, example and search indexes) to one file
+
+    The file starts with a small header holding the format version, so a snapshot
+    written by an incompatible version is rejected before its payload is unpickled.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Per-process temp name: several worker processes may save at once
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(SNAPSHOT_FORMAT_VERSION, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(tuple(snapshot), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def load_snapshot(path, sources):
+    """Load a compiled snapshot and check it against the current source files
+
+    A source whose mtime/inode/size stamp matches the stored one is trusted as is.
+    A source whose stamp differs (e.g. after a fresh checkout) is hashed, and kept
+    if its content is unchanged. Sources that really changed are reported so the
+    caller can re-parse just those on top of the loaded snapshot.
+
+    Args:
+        path: The compiled snapshot file
+        sources: Knowledge Base files the snapshot must cover, as a dict of the key
+            they are stored under (their path relative to the repository) -> path
+
+    Returns:
+        tuple: (KnowledgeBaseSnapshot with refreshed stamps, set of changed source keys),
+            or (None, None) if the file is missing, unreadable or of another format
+    """
+    try:
+        with open(path, 'rb') as f:
+            if pickle.load(f) != SNAPSHOT_FORMAT_VERSION:
+                return None, None
+            snapshot = KnowledgeBaseSnapshot(*pickle.load(f))
+    except Exception:
+        return None, None
+
+    stamps = {key: file_stamp(source) for key, source in sources.items()}
+    changed = set()
+    for key, source in sources.items():
+        if stamps[key] is not None and stamps[key] == snapshot.stamps.get(key):
+            continue
+        try:
+            if _file_hash(source) != snapshot.hashes.get(key):
+                changed.add(key)
+        except OSError:
+            changed.add(key)
+    # Unchanged files get their current stamp; changed ones keep the stored stamp so they get re-parsed
+    refreshed = {key: (snapshot.stamps.get(key) if key in changed else stamps[key]) for key in sources}
+    return snapshot._replace(stamps=refreshed), changed
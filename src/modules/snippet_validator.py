@@ -0,0 +1,309 @@
+import re
+import bisect
+import difflib
+from typing import NamedTuple
+
+from modules.component_graph import component_tag
+
+# Frameworks a snippet can be written for; they differ in how attributes name properties and events
+FRAMEWORKS = ("react", "angular", "html")
+
+# Opening tags of Modus components: React wrappers (<ModusWcButton) and custom elements (<modus-wc-button)
+_TAG_PATTERN = re.compile(r'(?<![\w.$])<(ModusWc[A-Za-z0-9]*|modus-wc-[a-z0-9-]*)')
+
+# One attribute (or the end of the tag) starting at the current position inside an opening tag
+_ATTRIBUTE_PATTERN = re.compile(
+    r'\s*(?:(/?>)|(\{)|([^\s=/>{"\']+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|(\{)))?)'
+)
+
+# Characters that matter while skipping a JSX expression: braces and the start of strings and comments
+_EXPRESSION_PATTERN = re.compile(r'[{}"\'`]|//|/\*')
+
+# Attributes every element accepts, in any framework
+_GLOBAL_ATTRIBUTES = frozenset({
+    "key", "ref", "id", "class", "className", "style", "slot", "role", "title", "tabIndex", "tabindex",
+    "hidden", "lang", "dir", "part", "children", "suppressHydrationWarning", "dangerouslySetInnerHTML",
+})
+
+# DOM events a handler may listen to on any element, besides the component's own events
+_DOM_EVENTS = frozenset({
+    "click", "dblclick", "focus", "blur", "focusin", "focusout", "input", "change", "submit", "keydown",
+    "keyup", "keypress", "mousedown", "mouseup", "mouseenter", "mouseleave", "mouseover", "mouseout",
+    "mousemove", "pointerdown", "pointerup", "pointerenter", "pointerleave", "pointermove", "touchstart",
+    "touchend", "touchmove", "contextmenu", "wheel", "scroll", "dragstart", "drag", "dragend", "dragenter",
+    "dragleave", "dragover", "drop", "copy", "cut", "paste",
+})
+
+# Angular attributes that belong to directives rather than to the component
+_ANGULAR_DIRECTIVE_PREFIXES = ("ng", "formControl", "formGroup", "formArray", "routerLink", "cdk", "mat")
+
+
+def _literal_values(type_text):
+    """Allowed values of a union of string literals like '"sm" | "md" | undefined', else None"""
+    values = set()
+    for part in type_text.split("|"):
+        part = part.strip()
+        if part in ("undefined", "null"):
+            continue
+        if len(part) < 2 or part[0] != '"' or part[-1] != '"':
+            return None
+        values.add(part[1:-1])
+    return frozenset(values) or None
+
+
+def _is_icon_property(component, name, type_text):
+    """Whether a property holds an icon name; flags like showIcon are booleans, not names"""
+    if "string" not in type_text:
+        return False
+    return name == "icon" or name.endswith("Icon") or (component == "ModusWcIcon" and name == "name")
+
+
+class ComponentSchema(NamedTuple):
+    """What a component accepts, precomputed from modus2_components.json"""
+    name: str
+    tag: str
+    properties: frozenset
+    attributes: dict
+    events: frozenset
+    values: dict
+    icon_properties: frozenset
+
+
+def _skip_expression(code, position):
+    """Offset just past the `}` closing the JSX expression whose `{` is at `position - 1`"""
+    depth = 1
+    size = len(code)
+    while depth:
+        match = _EXPRESSION_PATTERN.search(code, position)
+        if match is None:
+            return size
+        token = match.group(0)
+        position = match.end()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+        elif token == "//":
+            end = code.find("\n", position)
+            position = size if end == -1 else end
+        elif token == "/*":
+            end = code.find("*/", position)
+            position = size if end == -1 else end + 2
+        else:
+            # A string literal: skip to its unescaped closing quote
+            while True:
+                end = code.find(token, position)
+                if end == -1:
+                    return size
+                position = end + 1
+                backslashes = 0
+                while code[end - 1 - backslashes] == "\\":
+                    backslashes += 1
+                if backslashes % 2 == 0:
+                    break
+    return position
+
+
+def _expression_literal(expression):
+    """The string of an expression that is just a string literal ({"sm"} or [size]="'sm'"), else None"""
+    expression = expression.strip()
+    if len(expression) >= 2 and expression[0] == expression[-1] and expression[0] in "\"'`":
+        inner = expression[1:-1]
+        if expression[0] not in inner and "${" not in inner:
+            return inner
+    return None
+
+
+class SnippetValidator:
+    """Static checks of generated Modus markup against the component schemas and icon names
+
+    Only the opening tags of Modus components are parsed; everything else in the
+    snippet is skipped by one regex scan. Per-component property, attribute and
+    event sets are built once per snapshot, so each attribute costs a few hash
+    lookups. Suggestions are only computed for the attributes that fail.
+    """
+
+    def __init__(self, components, icon_index):
+        """
+        Args:
+            components: Mapping of component name to ComponentRecord
+            icon_index: IconIndex of the valid icon names
+        """
+        self.icon_index = icon_index
+        self.schemas = {}
+        self.by_tag = {}
+        for name, record in components.items():
+            properties = {prop.name: prop for prop in record.properties if prop.name}
+            values = {}
+            for prop_name, prop in properties.items():
+                allowed = _literal_values(prop.type or "")
+                if allowed is not None:
+                    values[prop_name] = allowed
+            schema = ComponentSchema(
+                name=name,
+                tag=component_tag(name),
+                properties=frozenset(properties),
+                attributes={component_tag(prop_name): prop_name for prop_name in properties},
+                events=frozenset(event.name for event in record.events if event.name),
+                values=values,
+                icon_properties=frozenset(prop_name for prop_name, prop in properties.items()
+                                          if _is_icon_property(name, prop_name, prop.type or "")),
+            )
+            self.schemas[name] = schema
+            self.by_tag[schema.tag] = schema
+
+    def validate(self, code, framework=None):
+        """Check every Modus component tag of a snippet
+
+        Args:
+            code: JSX/TSX, Angular template or HTML source
+            framework: "react", "angular" or "html"; by default React rules apply to
+                <ModusWc*> tags and custom element rules (any framework's bindings) to <modus-wc-*> tags
+
+        Returns:
+            dict: `valid`, `tags_checked` and every problem found, each with its line,
+                column, component, attribute, kind, message and suggestions
+        """
+        framework = framework.lower() if framework else None
+        if framework is not None and framework not in FRAMEWORKS:
+            raise ValueError(f"Unknown framework '{framework}'. Allowed values: {', '.join(FRAMEWORKS)}")
+
+        problems = []
+        tags_checked = 0
+        line_starts = None
+
+        def report(position, component, attribute, kind, message, suggestions=()):
+            nonlocal line_starts
+            # Tags nested in an attribute expression are reported after the attributes that follow
+            # it, so positions are not in order; line starts are only computed once a problem is found
+            if line_starts is None:
+                line_starts = [0] + [match.end() for match in re.finditer("\n", code)]
+            line = bisect.bisect_right(line_starts, position)
+            problems.append({
+                "line": line, "column": position - line_starts[line - 1] + 1, "component": component,
+                "attribute": attribute, "kind": kind, "message": message, "suggestions": list(suggestions),
+            })
+
+        for tag_match in _TAG_PATTERN.finditer(code):
+            tag_name = tag_match.group(1)
+            tags_checked += 1
+            jsx = tag_name[0] == "M"
+            schema = self.schemas.get(tag_name) if jsx else self.by_tag.get(tag_name)
+            if schema is None:
+                candidates = self.schemas if jsx else self.by_tag
+                report(tag_match.start(1), tag_name, None, "unknown_component",
+                       f"'{tag_name}' is not a Modus component",
+                       difflib.get_close_matches(tag_name, candidates, n=3, cutoff=0.6))
+
+            position = tag_match.end()
+            while True:
+                match = _ATTRIBUTE_PATTERN.match(code, position)
+                if match is None or match.group(1) or match.end() == position:
+                    break
+                position = match.end()
+                if match.group(2) or match.group(6):
+                    # Spread props, comments and expression values are skipped, not evaluated
+                    end = _skip_expression(code, position)
+                    expression = code[position:end - 1] if match.group(6) else None
+                    position = end
+                else:
+                    expression = None
+                if match.group(2) or schema is None:
+                    continue
+                value = match.group(4) if match.group(4) is not None else match.group(5)
+                self._check_attribute(schema, jsx, framework, match.group(3), value, expression,
+                                      match.start(3), report)
+
+        return {
+            "valid": not problems,
+            "framework": framework or "auto",
+            "tags_checked": tags_checked,
+            "problem_count": len(problems),
+            "problems": problems,
+        }
+
+    def _check_attribute(self, schema, jsx, framework, attribute, value, expression, position, report):
+        name = attribute
+        kind = "static"
+        if name[0] == "(" and name[-1] == ")" and not name.startswith("(["):
+            name, kind = name[1:-1], "event"
+        elif name.startswith("[(") and name.endswith(")]"):
+            name, kind = name[2:-2], "binding"
+        elif name[0] == "[" and name[-1] == "]":
+            name, kind = name[1:-1], "binding"
+            expression = value
+            value = None
+        elif name[0] in "#*@" or ":" in name:
+            # Template references, structural directives, animations and namespaced attributes
+            return
+
+        # A global attribute the component declares itself (ModusWcAlert's role) is checked as its property
+        if kind != "event" and ((name in _GLOBAL_ATTRIBUTES and name not in schema.properties)
+                                or name.startswith(("aria-", "data-"))):
+            return
+        if kind == "binding" and "." in name:
+            # [attr.x], [class.x] and [style.x] bind to the element, not to a component input
+            return
+        if kind != "event" and name.startswith(_ANGULAR_DIRECTIVE_PREFIXES) and not jsx:
+            return
+
+        prop = self._resolve_property(schema, jsx, framework, name, kind)
+        if prop is None and kind == "static" and len(name) > 2 and name.startswith("on") \
+                and (name[2].isupper() or not jsx):
+            # React handlers (onButtonClick) and HTML handler attributes (onclick)
+            name, kind = name[2].lower() + name[3:], "handler"
+
+        if kind in ("event", "handler"):
+            if name in schema.events or name.lower() in _DOM_EVENTS:
+                return
+            matches = [event for event in schema.events if event.lower() == name.lower()]
+            candidates = matches or difflib.get_close_matches(name, schema.events, n=3, cutoff=0.6)
+            if kind == "event":
+                suggestions = [f"({event})" for event in candidates]
+            else:
+                suggestions = ["on" + event[0].upper() + event[1:] for event in candidates]
+            report(position, schema.name, attribute, "unknown_event", f"{schema.name} has no '{name}' event",
+                   suggestions)
+            return
+
+        if prop is None:
+            suggestion = schema.attributes.get(name) or schema.attributes.get(component_tag(name)) \
+                or next((p for p in schema.properties if p.lower() == name.lower()), None)
+            if suggestion is not None:
+                suggestions = [suggestion if jsx or framework != "html" else component_tag(suggestion)]
+            else:
+                spellings = schema.properties if jsx or framework != "html" else schema.attributes
+                suggestions = difflib.get_close_matches(name, spellings, n=3, cutoff=0.6)
+            if suggestion is not None:
+                message = f"Write the {suggestion} property of {schema.name} as '{suggestions[0]}'"
+            else:
+                message = f"{schema.name} has no '{name}' property"
+            report(position, schema.name, attribute, "unknown_property", message, suggestions)
+            return
+
+        if value is None and expression is not None:
+            value = _expression_literal(expression)
+        if value is None:
+            return
+        if prop in schema.icon_properties:
+            if value and self.icon_index.resolve(value) is None:
+                report(position, schema.name, attribute, "invalid_icon", f"'{value}' is not a Modus icon",
+                       self.icon_index.suggest(value, 3))
+            return
+        allowed = schema.values.get(prop)
+        if allowed is not None and value not in allowed:
+            report(position, schema.name, attribute, "invalid_value",
+                   f"'{value}' is not a valid {prop}; expected one of {', '.join(sorted(allowed))}",
+                   difflib.get_close_matches(value, allowed, n=3, cutoff=0.5) or sorted(allowed))
+
+    @staticmethod
+    def _resolve_property(schema, jsx, framework, name, kind):
+        """The property an attribute sets, or None if that spelling does not set one"""
+        if name in schema.properties:
+            # Plain HTML lowercases attribute names, so only the kebab-case spelling reaches the component
+            return name if framework != "html" or jsx or kind == "binding" or name.islower() else None
+        if kind == "binding":
+            # Angular input bindings use the camelCase property name
+            return None
+        # Kebab-case attributes are reflected to their property by the web component in every framework
+        return schema.attributes.get(name)
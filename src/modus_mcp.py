@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import logging
+import argparse
+
+# Command-line entry point for the Modus MCP server.
+#
+# Only the standard library is imported here. The MCP/FastMCP stack (and the SSE/HTTP
+# server it pulls in) is imported once the arguments say a server is actually needed,
+# and the Knowledge Base is loaded on the first tool call, so `--help`, argument errors
+# and `--build-snapshot` never pay for either.
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Modus Web Components MCP server")
+    parser.add_argument("--transport", choices=("stdio", "sse"), default="sse",
+                        help="stdio for a per-editor server on stdin/stdout, sse for a shared HTTP server (default)")
+    parser.add_argument("--host", default=None, help="SSE bind address")
+    parser.add_argument("--port", type=int, default=None, help="SSE port (default 3001)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="SSE worker processes sharing the port and the loaded Knowledge Base (0: one per CPU)")
+    parser.add_argument("--log-level", default=os.environ.get("MODUS_MCP_LOG_LEVEL", "INFO"),
+                        help="Logging level (default INFO, or $MODUS_MCP_LOG_LEVEL)")
+    parser.add_argument("--no-watch", action="store_true", help="Do not hot-reload Knowledge Base edits")
+    parser.add_argument("--build-snapshot", action="store_true",
+                        help="Compile the Knowledge Base into .cache/kb_snapshot.pickle and exit")
+    return parser
+
+
+def configure_logging(level):
+    logging.basicConfig(
+        level=level.upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        # Logs always go to stderr; with --transport stdio, stdout carries the protocol.
+        # FastMCP installs its own handler at import time; replace it so the level applies
+        force=True
+    )
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    configure_logging(args.log_level)
+
+    if args.build_snapshot:
+        from modules.component_registry import ComponentRegistry
+
+        start = time.perf_counter()
+        path = ComponentRegistry().compile_snapshot()
+        logging.getLogger("modus_mcp").info("Compiled knowledge base snapshot to %s in %.1f ms",
+                                            path, (time.perf_counter() - start) * 1000)
+        return 0
+
+    import ModusFromMCP
+
+    try:
+        ModusFromMCP.serve(args.transport, host=args.host, port=args.port, watch=not args.no_watch,
+                           workers=args.workers)
+    except Exception as e:
+        ModusFromMCP.logger.error("Error starting server: %s", e)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
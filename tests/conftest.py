@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+# Make the server module and src/modules importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from modules.component_registry import ComponentRegistry
+from perf import KB_ROOT, build_scaled_kb
+
+
+@pytest.fixture(scope="session")
+def registry():
+    """Registry over the real Knowledge Base, loaded once"""
+    registry = ComponentRegistry()
+    registry.snapshot()
+    return registry
+
+
+@pytest.fixture(scope="session")
+def react_kb_text():
+    with open(os.path.join(KB_ROOT, "modus2_react_KB.md"), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="session")
+def scaled_registry(tmp_path_factory):
+    """Factory for registries over synthetic Knowledge Bases 1x, 10x or 100x the real size, built once per scale"""
+    registries = {}
+
+    def get(scale):
+        if scale not in registries:
+            root = build_scaled_kb(str(tmp_path_factory.mktemp(f"kb_{scale}x")), scale)
+            registries[scale] = ComponentRegistry(base_path=root)
+            registries[scale].snapshot()
+        return registries[scale]
+
+    return get
@@ -0,0 +1,104 @@
+import os
+import re
+import json
+import time
+import shutil
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KB_ROOT = os.path.join(REPO_ROOT, "Knowledge Base")
+
+# Multiplier for every time budget, for slow or noisy CI runners (e.g. MODUS_PERF_BUDGET_SCALE=3)
+BUDGET_SCALE = float(os.environ.get("MODUS_PERF_BUDGET_SCALE", "1"))
+
+_COMPONENT_HEADING_PATTERN = re.compile(r'^# (ModusWc[A-Za-z]+)[ \t]*$', re.MULTILINE)
+
+
+def assert_within_budget(benchmark, budget_us):
+    """Fail when a benchmark's mean time per call exceeds its budget
+
+    Budgets are at least 10x what a development machine measures, so they catch
+    algorithmic regressions (a lookup going back to re-parsing, say), not noise.
+    """
+    if benchmark.disabled or benchmark.stats is None:
+        return
+    mean_us = benchmark.stats.stats.mean * 1e6
+    limit_us = budget_us * BUDGET_SCALE
+    assert mean_us <= limit_us, f"{benchmark.name}: mean {mean_us:.1f} us exceeds the {limit_us:.1f} us budget"
+
+
+def best_of(func, repeat=5):
+    """Best wall-clock time of several calls, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def assert_scales_linearly(times_by_scale, slack=2.0):
+    """Fail if going from the smallest to a larger scale costs more than `slack` times proportionally"""
+    base_scale = min(times_by_scale)
+    for scale, seconds in times_by_scale.items():
+        ratio = seconds / times_by_scale[base_scale]
+        allowed = scale / base_scale * slack * BUDGET_SCALE
+        assert ratio <= allowed, (
+            f"{scale}x input took {ratio:.1f}x as long as {base_scale}x (allowed {allowed:.1f}x): super-linear"
+        )
+
+
+def copy_suffix(copy):
+    """Name suffix of the n-th synthetic copy; the original keeps its names"""
+    return "" if copy == 0 else f"X{copy}"
+
+
+def scale_kb_text(text, scale):
+    """A knowledge base with every component section repeated under renamed headings"""
+    copies = [text]
+    for copy in range(1, scale):
+        suffix = copy_suffix(copy)
+        copies.append(_COMPONENT_HEADING_PATTERN.sub(lambda match: f"# {match.group(1)}{suffix}", text))
+    return "\n".join(copies)
+
+
+def _rename_dependencies(data, copy):
+    """Point a copied component's dependency tags at the same copy (modus-wc-icon -> modus-wc-icon-x3)"""
+    if copy == 0 or not data.get("dependencies"):
+        return data
+    suffix = "-" + copy_suffix(copy).lower()
+    dependencies = {relation: [tag + suffix for tag in tags] for relation, tags in data["dependencies"].items()}
+    return {**data, "dependencies": dependencies}
+
+
+def build_scaled_kb(root, scale):
+    """Write a Knowledge Base `scale` times the size of the real one under `root`
+
+    Components, example sections and icons are repeated with suffixed names
+    (ModusWcButton, ModusWcButtonX1, ...); the documentation is copied as is.
+
+    Returns:
+        str: `root`, usable as ComponentRegistry(base_path=root)
+    """
+    kb_root = os.path.join(root, "Knowledge Base")
+    shutil.copytree(os.path.join(KB_ROOT, "Modus 2"), os.path.join(kb_root, "Modus 2"))
+
+    with open(os.path.join(KB_ROOT, "modus2_components.json"), encoding="utf-8") as f:
+        components = json.load(f)
+    scaled_components = {
+        name + copy_suffix(copy): _rename_dependencies(data, copy) for copy in range(scale)
+        for name, data in components.items()
+    }
+    with open(os.path.join(kb_root, "modus2_components.json"), "w", encoding="utf-8") as f:
+        json.dump(scaled_components, f)
+
+    with open(os.path.join(KB_ROOT, "modus_icons.json"), encoding="utf-8") as f:
+        icons = json.load(f)["icons"]
+    with open(os.path.join(kb_root, "modus_icons.json"), "w", encoding="utf-8") as f:
+        json.dump({"icons": [icon + copy_suffix(copy).lower() for copy in range(scale) for icon in icons]}, f)
+
+    for name in ("modus2_react_KB.md", "modus2_angular_KB.md"):
+        with open(os.path.join(KB_ROOT, name), encoding="utf-8") as f:
+            text = f.read()
+        with open(os.path.join(kb_root, name), "w", encoding="utf-8") as f:
+            f.write(scale_kb_text(text, scale))
+    return root
@@ -0,0 +1,63 @@
+import pytest
+
+from perf import assert_within_budget
+
+
+def test_resolve_is_case_insensitive(registry):
+    icon = registry.get_all_icon_names()[0]
+    assert registry.resolve_icon(icon.upper()) == {"valid": True, "icon": icon, "suggestions": []}
+
+
+def test_resolve_unknown_suggests(registry):
+    result = registry.resolve_icon("arow_back")
+    assert result["valid"] is False
+    assert "arrow_back" in result["suggestions"]
+
+
+@pytest.mark.parametrize("prefix", ["a", "ar", "arrow", "zzz"])
+def test_prefix_matches_linear_scan(registry, prefix):
+    expected = sorted((icon for icon in registry.get_all_icon_names() if icon.lower().startswith(prefix)),
+                      key=str.lower)
+    assert registry.get_icon_names_by_char(prefix) == expected
+
+
+@pytest.mark.parametrize("text", ["arrow", "down", "x"])
+def test_substring_matches_linear_scan(registry, text):
+    expected = sorted((icon for icon in registry.get_all_icon_names() if text in icon.lower()), key=str.lower)
+    assert sorted(registry.get_icon_names_containing(text), key=str.lower) == expected
+
+
+@pytest.mark.parametrize("text", ["arrow", "ar", "zzz"])
+def test_substring_count(registry, text):
+    assert registry.snapshot().icon_index.count_substring(text) == len(registry.get_icon_names_containing(text))
+
+
+@pytest.mark.parametrize("text", ["arrow", "ar"])
+def test_substring_limit_keeps_sorted_order(registry, text):
+    assert registry.get_icon_names_containing(text, 5) == registry.get_icon_names_containing(text)[:5]
+
+
+def test_limits(registry):
+    assert registry.get_icon_names_by_char("a", 0) == registry.get_icon_names_containing("arrow", 0) == []
+    assert registry.get_all_icon_names(0) == []
+    with pytest.raises(ValueError):
+        registry.get_icon_names_by_char("a", -3)
+    with pytest.raises(ValueError):
+        registry.get_icon_names_containing("arrow", -3)
+    with pytest.raises(ValueError):
+        registry.get_all_icon_names(-3)
+
+
+def test_icon_prefix_speed(benchmark, registry):
+    benchmark(registry.get_icon_names_by_char, "ar", 20)
+    assert_within_budget(benchmark, 50)
+
+
+def test_icon_substring_speed(benchmark, registry):
+    benchmark(registry.get_icon_names_containing, "arrow", 20)
+    assert_within_budget(benchmark, 500)
+
+
+def test_resolve_icon_speed(benchmark, registry):
+    benchmark(registry.resolve_icon, "arow_back")
+    assert_within_budget(benchmark, 10_000)
@@ -0,0 +1,122 @@
+import re
+
+import pytest
+
+from modules.kb_index import iter_code_blocks, parse_kb_examples
+from perf import assert_within_budget
+
+_COMPONENT_HEADING_PATTERN = re.compile(r'^# (\S+)[ \t]*$', re.MULTILINE)
+_PROMPT_HEADING_PATTERN = re.compile(r'^## Prompt (\d+)', re.MULTILINE)
+
+
+def _kb_components(text):
+    return _COMPONENT_HEADING_PATTERN.findall(text)
+
+
+def _expected_prompt_numbers(text, component):
+    """Prompt numbers under a component heading, found independently of the parser"""
+    headings = list(_COMPONENT_HEADING_PATTERN.finditer(text))
+    for i, heading in enumerate(headings):
+        if heading.group(1) == component:
+            end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+            return [int(number) for number in _PROMPT_HEADING_PATTERN.findall(text[heading.start():end])]
+    return []
+
+
+def test_kb_has_42_components(react_kb_text):
+    assert len(_kb_components(react_kb_text)) == 42
+
+
+def test_extract_examples_for_every_component(registry, react_kb_text):
+    for component in _kb_components(react_kb_text):
+        examples = registry._extract_examples_from_markdown_content(react_kb_text, component)
+        assert [example["prompt_number"] for example in examples] == \
+            _expected_prompt_numbers(react_kb_text, component), component
+        for example in examples:
+            assert example["question"], (component, example["prompt_number"])
+            assert example["code"], (component, example["prompt_number"])
+            assert example["content"].startswith(f"## Prompt {example['prompt_number']}")
+
+
+def test_examples_are_offsets_into_the_kb(react_kb_text):
+    buffer = react_kb_text.encode("utf-8")
+    index, _ = parse_kb_examples(buffer)
+    for records in index.values():
+        for record in records:
+            # No text is copied: every record slices the one shared buffer
+            assert record.source is buffer
+            assert buffer[record.start:record.end].decode("utf-8") == record.content
+
+
+def test_prompts_beyond_nine_are_found():
+    # The original extractor scanned a hardcoded "Prompt 1".."Prompt 9" range
+    text = "# ModusWcButton\n\n" + "".join(
+        f"## Prompt {number}\n\n**User Question:** Q{number}?\n\n**Agent Answer:**\n\n```tsx\nx{number}\n```\n\n"
+        for number in range(1, 13)
+    )
+    index, _ = parse_kb_examples(text)
+    assert [record.prompt_number for record in index["ModusWcButton"]] == list(range(1, 13))
+    assert index["ModusWcButton"][-1].code == "x12"
+
+
+def test_unchanged_sections_are_reused(react_kb_text):
+    _, sections = parse_kb_examples(react_kb_text)
+    edited = react_kb_text.replace("# ModusWcAccordion\n", "# ModusWcAccordion\n\nEdited.\n", 1)
+    index, new_sections = parse_kb_examples(edited, sections)
+    assert len(new_sections.keys() - sections.keys()) == 1
+    buffer = edited.encode("utf-8")
+    for records in index.values():
+        for record in records:
+            assert buffer[record.start:record.end].decode("utf-8") == record.content
+
+
+def test_every_code_block_is_found_with_its_lines(react_kb_text):
+    lines = react_kb_text.split("\n")
+    buffer = react_kb_text.encode("utf-8")
+    fences = [line for line in lines if line.lstrip().startswith("```")]
+    blocks = list(iter_code_blocks(buffer))
+    assert len(blocks) * 2 == len(fences)
+    for component, prompt_number, block in blocks:
+        assert buffer[block.start:block.end].decode("utf-8") == block.code
+        assert lines[block.start_line - 1].lstrip() == "```" + block.language
+        assert lines[block.end_line - 1].strip() == "```"
+
+
+def test_all_blocks_of_a_prompt_are_kept():
+    text = ("# ModusWcAvatar\n\n## Prompt 1\n\n**User Question:** Q?\n\n**Agent Answer:**\n\n"
+            "```html\n<modus-wc-avatar></modus-wc-avatar>\n```\n\n```\nplain\n```\n\n```TSX\nexport {}\n```\n")
+    example = parse_kb_examples(text)[0]["ModusWcAvatar"][0]
+    assert [block.language for block in example.code_blocks] == ["html", "", "tsx"]
+    # `code` is the component code, not whichever fence marker happened to be tried first
+    assert example.code == "export {}"
+    assert [(block.start_line, block.end_line) for block in example.code_blocks] == [(9, 11), (13, 15), (17, 19)]
+    assert list(iter_code_blocks(text))[1][:2] == ("ModusWcAvatar", 1)
+
+
+def test_language_tag_is_not_part_of_the_code(registry):
+    for example in registry.snapshot().examples["angular"].values():
+        for record in example:
+            assert not record.code.startswith("ts\n")
+
+
+def test_reused_sections_keep_block_lines(react_kb_text):
+    _, sections = parse_kb_examples(react_kb_text)
+    edited = react_kb_text.replace("# ModusWcAccordion\n", "# ModusWcAccordion\n\nEdited.\n", 1)
+    reused, _ = parse_kb_examples(edited, sections)
+    assert reused == parse_kb_examples(edited)[0]
+
+
+@pytest.mark.parametrize("component", ["ModusWcAccordion", "ModusWcButton", "ModusWcTable"])
+def test_extract_examples_speed(benchmark, registry, react_kb_text, component):
+    benchmark(registry._extract_examples_from_markdown_content, react_kb_text, component)
+    assert_within_budget(benchmark, 30_000)
+
+
+def test_parse_kb_speed(benchmark, react_kb_text):
+    benchmark(parse_kb_examples, react_kb_text)
+    assert_within_budget(benchmark, 100_000)
+
+
+def test_iter_code_blocks_speed(benchmark, react_kb_text):
+    benchmark(lambda: list(iter_code_blocks(react_kb_text)))
+    assert_within_budget(benchmark, 50_000)
@@ -0,0 +1,159 @@
+import json
+import shutil
+
+import pytest
+
+from modules.component_registry import ComponentRegistry
+from modules.doc_sections import DocLibrary
+from modules.search_index import SearchIndex
+from perf import KB_ROOT, assert_within_budget, build_scaled_kb
+
+
+def test_all_components_listed(registry):
+    with open(f"{KB_ROOT}/modus2_components.json", encoding="utf-8") as f:
+        names = list(json.load(f))
+    assert registry.get_all_components() == names
+
+
+def test_compact_members_round_trip_to_the_json(registry):
+    with open(f"{KB_ROOT}/modus2_components.json", encoding="utf-8") as f:
+        data = json.load(f)
+    for name, component in data.items():
+        details = registry.get_component_details(name, fields=["properties", "events"])
+        if details is None:
+            continue
+        # Same entries, with keys in file order
+        assert [list(prop.items()) for prop in details["properties"]] == \
+            [list(prop.items()) for prop in component.get("properties", [])]
+        assert details["events"] == component.get("events", [])
+
+
+def test_repeated_strings_are_shared(registry):
+    types = [prop.type for record in registry.snapshot().components.values() for prop in record.properties
+             if prop.type == "string | undefined"]
+    assert len(types) > 10
+    assert all(value is types[0] for value in types)
+
+
+def test_component_details_projection(registry):
+    details = registry.get_component_details("ModusWcButton", fields=["properties", "events"])
+    assert set(details) == {"properties", "events"}
+    assert any(event["name"] == "buttonClick" for event in details["events"])
+
+
+def test_component_details_paging(registry):
+    all_examples = registry.get_component_details("ModusWcButton", fields=["examples"])
+    page = registry.get_component_details("ModusWcButton", fields=["examples"], max_examples=1, offset=1)
+    assert page["example_count"] == all_examples["example_count"] >= 2
+    assert page["examples"] == all_examples["examples"][1:2]
+
+
+def test_component_details_unknown_and_invalid(registry):
+    assert registry.get_component_details("ModusWcNope") is None
+    with pytest.raises(ValueError):
+        registry.get_component_details("ModusWcButton", fields=["nope"])
+
+
+def test_angular_examples_fall_back_to_react(registry):
+    details = registry.get_component_details("ModusWcTable", framework="angular", fields=["examples"])
+    assert details["examples_fallback"] is True
+    assert details["examples_framework"] == "react"
+
+
+def test_batch_details_hoist_shared_definitions(registry):
+    result = registry.get_components_details(["ModusWcTextInput", "ModusWcTextarea", "ModusWcNope"],
+                                             fields=["properties"])
+    assert result["unknown"] == ["ModusWcNope"]
+    shared = result["shared_properties"]
+    assert shared
+    for details in result["components"].values():
+        # Hoisted definitions are referenced by name and no longer repeated inline
+        assert set(details["shared_properties"]) <= set(shared)
+        assert not {prop["name"] for prop in details["properties"]} & set(details["shared_properties"])
+
+
+def test_search_ranks_component_first(registry):
+    hits = registry.search("ModusWcSelect dropdown", k=5)
+    assert hits and hits[0]["component"] == "ModusWcSelect"
+
+
+def test_search_index_rebuild_reuses_unchanged_documents(registry):
+    index = registry.snapshot().search_index
+    documents = list(index.documents)
+    documents[3] = documents[3]._replace(text=documents[3].text + " edited tooltip")
+    rebuilt = SearchIndex.build(documents, "edited", previous=index)
+    fresh = SearchIndex.build(documents, "edited")
+    assert list(rebuilt.postings.weights) == list(fresh.postings.weights)
+    assert rebuilt.search("edited tooltip") == fresh.search("edited tooltip")
+
+
+def test_compiled_snapshot_survives_moving_the_checkout(tmp_path):
+    root = build_scaled_kb(str(tmp_path / "before"), 1)
+    snapshot = ComponentRegistry(base_path=root).snapshot()
+    assert set(snapshot.stamps) == set(snapshot.hashes) and "Knowledge Base/modus_icons.json" in snapshot.stamps
+
+    moved = str(tmp_path / "after")
+    shutil.move(root, moved)
+    registry = ComponentRegistry(base_path=moved)
+    assert registry.snapshot().stamps.keys() == snapshot.stamps.keys()
+    assert registry.get_reload_metrics()["initial_load_source"] == "compiled"
+    assert registry.get_installation_guidelines() == snapshot.docs["Knowledge Base/Modus 2/Modus2_guidelines.md"]
+
+
+def test_doc_section_rejects_negative_offset(registry):
+    with pytest.raises(ValueError):
+        registry.get_doc_section("combined_modus2.md", "modus-wc-button > Properties", offset=-5)
+
+
+def test_doc_section_of_a_file_that_shrank(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("# Title\n\n" + "é" * 100 + "\n", encoding="utf-8")
+    library = DocLibrary(str(tmp_path), [str(path)])
+    section, _ = library.find_section("doc.md", "Title")
+    # Truncated after indexing, without changing its stamp enough to be re-indexed first
+    with open(path, "r+b") as f:
+        f.truncate(section.end - 51)
+    text, next_offset = library.read_section("doc.md", section, max_bytes=section.end)
+    assert text == path.read_bytes()[section.start:].decode("utf-8") and next_offset is None
+    assert library.read_section("doc.md", section, offset=section.end - 40) == ("", None)
+
+
+def test_related_components(registry):
+    related = registry.get_related_components("ModusWcTable")
+    assert {"ModusWcPagination", "ModusWcCheckbox"} <= {entry["name"] for entry in related["related"]}
+
+
+def test_get_component_details_speed(benchmark, registry):
+    benchmark(registry.get_component_details, "ModusWcButton")
+    assert_within_budget(benchmark, 200)
+
+
+def test_get_component_details_projected_speed(benchmark, registry):
+    benchmark(registry.get_component_details, "ModusWcButton", fields=["properties", "events"])
+    assert_within_budget(benchmark, 100)
+
+
+def test_get_components_details_speed(benchmark, registry):
+    names = ["ModusWcTextInput", "ModusWcSelect", "ModusWcButton", "ModusWcCheckbox", "ModusWcTextarea"]
+    benchmark(registry.get_components_details, names, fields=["properties", "events"])
+    assert_within_budget(benchmark, 2500)
+
+
+def test_get_all_components_speed(benchmark, registry):
+    benchmark(registry.get_all_components)
+    assert_within_budget(benchmark, 20)
+
+
+def test_search_speed(benchmark, registry):
+    benchmark(registry.search, "dropdown select options", k=10)
+    assert_within_budget(benchmark, 2000)
+
+
+def test_find_similar_examples_speed(benchmark, registry):
+    benchmark(registry.find_similar_examples, "accordion with icons and descriptions", k=5)
+    assert_within_budget(benchmark, 500)
+
+
+def test_get_doc_section_speed(benchmark, registry):
+    benchmark(registry.get_doc_section, "combined_modus2.md", "modus-wc-button > Properties")
+    assert_within_budget(benchmark, 1000)
@@ -0,0 +1,85 @@
+import os
+import time
+
+import pytest
+
+from modules.component_registry import ComponentRegistry
+from modules.kb_watcher import KnowledgeBaseWatcher
+from perf import build_scaled_kb
+
+
+def edit(path, old, new):
+    """Replace `old` in a Knowledge Base file and move its mtime forward so the stamp always changes"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    assert old in text
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text.replace(old, new, 1))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def kb_registry(tmp_path):
+    """Registry over a private copy of the Knowledge Base that a test may edit"""
+    registry = ComponentRegistry(base_path=build_scaled_kb(str(tmp_path), 1))
+    registry.snapshot()
+    return registry
+
+
+def test_unchanged_files_do_not_reload(kb_registry):
+    before = kb_registry.snapshot()
+    assert kb_registry.reload_if_changed() is False
+    assert kb_registry.snapshot() is before
+
+
+def test_one_section_edit_reindexes_one_section(kb_registry):
+    before = kb_registry.snapshot()
+    edit(kb_registry.react_kb_path, "Main message text displayed in the alert", "Headline of the alert")
+
+    assert kb_registry.reload_if_changed() is True
+    after = kb_registry.snapshot()
+    assert after.generation == before.generation + 1
+    metrics = kb_registry.get_reload_metrics()
+    assert metrics["last_changed_files"] == ["modus2_react_KB.md"]
+    assert metrics["last_reindexed_sections"] == 1
+    assert "Headline of the alert" in after.get_examples("ModusWcAlert")[0].to_dict()["content"]
+
+
+def test_held_snapshot_is_unchanged_by_a_reload(kb_registry):
+    held = kb_registry.snapshot()
+    content = held.get_examples("ModusWcAlert")[0].to_dict()["content"]
+    edit(kb_registry.react_kb_path, "Main message text displayed in the alert", "Headline of the alert")
+    edit(kb_registry.icons_path, '"icons": [', '"icons": ["brand_new_icon", ')
+
+    assert kb_registry.reload_if_changed() is True
+    assert held.get_examples("ModusWcAlert")[0].to_dict()["content"] == content
+    assert held.icon_index.resolve("brand_new_icon") is None
+    assert kb_registry.snapshot().icon_index.resolve("brand_new_icon") == "brand_new_icon"
+
+
+def test_broken_json_keeps_the_previous_data(kb_registry):
+    before = kb_registry.snapshot()
+    edit(kb_registry.components_path, "{", "{ broken")
+
+    kb_registry.reload_if_changed()
+    after = kb_registry.snapshot()
+    assert after.components is before.components
+    assert kb_registry.get_component_details("ModusWcButton") is not None
+    # The broken file's stamp is recorded, so it is only retried once it changes again
+    assert kb_registry.reload_if_changed() is False
+
+
+def test_watcher_picks_up_an_edit(kb_registry):
+    generation = kb_registry.snapshot().generation
+    watcher = KnowledgeBaseWatcher(kb_registry, interval=0.01)
+    watcher.start()
+    try:
+        edit(kb_registry.react_kb_path, "Main message text displayed in the alert", "Headline of the alert")
+        deadline = time.monotonic() + 10
+        while kb_registry.snapshot().generation == generation and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+    assert kb_registry.snapshot().generation == generation + 1
+    assert kb_registry.get_reload_metrics()["last_reindexed_sections"] == 1
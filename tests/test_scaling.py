@@ -0,0 +1,77 @@
+"""Synthetic Knowledge Bases 10x and 100x the real size, to expose super-linear behaviour
+
+Lookups are index-backed and must stay roughly flat as the Knowledge Base grows;
+parsing and index builds must grow at most linearly.
+"""
+import pytest
+
+from modules.icon_index import IconIndex
+from modules.kb_index import parse_kb_examples
+from modules.search_index import SearchIndex, build_search_documents
+from perf import assert_scales_linearly, assert_within_budget, best_of, scale_kb_text
+
+SCALES = (1, 10, 100)
+
+
+@pytest.fixture(scope="module")
+def registries(scaled_registry):
+    return {scale: scaled_registry(scale) for scale in SCALES}
+
+
+def test_scaled_registry_contents(registries):
+    base = registries[1].snapshot()
+    for scale, registry in registries.items():
+        snapshot = registry.snapshot()
+        assert len(snapshot.components) == scale * len(base.components)
+        assert len(snapshot.icons) == scale * len(base.icons)
+        assert registry.get_component_details(f"ModusWcButtonX{scale - 1}" if scale > 1 else "ModusWcButton",
+                                              fields=["examples"])["example_count"] > 0
+
+
+def test_parse_kb_scales_linearly(react_kb_text):
+    times = {scale: best_of(lambda: parse_kb_examples(text), repeat=3)
+             for scale, text in ((scale, scale_kb_text(react_kb_text, scale)) for scale in SCALES)}
+    assert_scales_linearly(times)
+
+
+def test_index_builds_scale_linearly(registries):
+    times = {}
+    for scale, registry in registries.items():
+        snapshot = registry.snapshot()
+        times[scale] = best_of(lambda: (
+            IconIndex(snapshot.icons),
+            SearchIndex.build(build_search_documents(snapshot.components, snapshot.examples, {}), ""),
+        ), repeat=1 if scale == 100 else 3)
+    assert_scales_linearly(times)
+
+
+@pytest.mark.parametrize("lookup", [
+    lambda registry: registry.get_component_details("ModusWcButton"),
+    lambda registry: registry.get_components_details(["ModusWcTextInput", "ModusWcSelect"], fields=["properties"]),
+    lambda registry: registry.get_icon_names_by_char("arrow", 20),
+    lambda registry: registry.resolve_icon("arrow_back"),
+    lambda registry: registry.get_related_components("ModusWcTable", depth=2),
+], ids=["component_details", "components_details", "icon_prefix", "resolve_icon", "related_components"])
+def test_lookups_do_not_grow_with_kb_size(registries, lookup):
+    times = {scale: best_of(lambda: [lookup(registry) for _ in range(50)]) for scale, registry in registries.items()}
+    # 100x the data may cost a few cache misses more, not 100x the time
+    assert times[100] <= times[1] * 5, {scale: f"{seconds * 1e6 / 50:.1f} us" for scale, seconds in times.items()}
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_search_speed_by_scale(benchmark, registries, scale):
+    benchmark(registries[scale].search, "dropdown select options", k=10)
+    # Postings lists grow with the data, so search is allowed to grow linearly
+    assert_within_budget(benchmark, 2000 * scale)
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_find_similar_examples_speed_by_scale(benchmark, registries, scale):
+    benchmark(registries[scale].find_similar_examples, "accordion with icons and descriptions", k=5)
+    assert_within_budget(benchmark, 500 * scale)
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_icon_substring_speed_by_scale(benchmark, registries, scale):
+    benchmark(registries[scale].get_icon_names_containing, "arrow", 20)
+    assert_within_budget(benchmark, 500)
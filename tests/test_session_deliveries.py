@@ -0,0 +1,119 @@
+import gc
+import json
+import asyncio
+
+import pytest
+
+from modules.response_cache import ResponseCache
+from modules.session_deliveries import SessionDeliveries
+from perf import assert_within_budget
+
+
+class Session:
+    """Stands in for an MCP session: any weak-referenceable object"""
+
+
+# Longer than a reference reply, like a real component's details
+DESCRIPTION = "A button triggers an action or event, such as submitting a form or opening a dialog. " * 5
+
+
+class Harness:
+    """A session-aware cached handler whose session and snapshot generation the test controls"""
+
+    def __init__(self):
+        self.session = Session()
+        self.generation = 1
+        self.documents = {"ModusWcButton": {"description": DESCRIPTION, "properties": ["size", "variant"]}}
+        self.deliveries = SessionDeliveries(lambda: self.session)
+        self.cache = ResponseCache(lambda: self.generation, deliveries=self.deliveries)
+
+        @self.cache.cached
+        async def details(name, if_none_match=None, force_full=False):
+            return {"success": True, "component": name, **self.documents[name]}
+
+        self.handler = details
+
+    def call(self, name="ModusWcButton", **kwargs):
+        return json.loads(asyncio.run(self.handler(name, **kwargs)))
+
+
+@pytest.fixture
+def harness():
+    return Harness()
+
+
+def test_repeated_call_is_a_reference(harness):
+    first = harness.call()
+    assert first["properties"] == ["size", "variant"]
+    second = harness.call()
+    assert second["unchanged"] and second["already_sent"] and second["etag"] == first["etag"]
+    assert "properties" not in second
+
+
+def test_force_full_resends(harness):
+    first = harness.call()
+    harness.call()
+    assert harness.call(force_full=True) == first
+
+
+def test_sessions_are_tracked_separately(harness):
+    first = harness.call()
+    harness.session = Session()
+    assert harness.call() == first
+
+
+def test_changed_fields_only_after_reload(harness):
+    first = harness.call()
+    harness.documents["ModusWcButton"] = {"description": DESCRIPTION, "properties": ["size", "variant", "shape"]}
+    harness.generation = 2
+    delta = harness.call()
+    assert delta["delta"] and delta["base_etag"] == first["etag"] and delta["etag"] != first["etag"]
+    assert delta["changed"] == {"properties": ["size", "variant", "shape"]}
+    assert delta["removed"] == []
+    assert harness.call()["already_sent"]
+
+
+def test_reload_without_changes_is_a_reference(harness):
+    first = harness.call()
+    harness.generation = 2
+    assert harness.call()["etag"] == first["etag"]
+
+
+def test_full_payload_once_the_old_response_is_evicted(harness):
+    harness.call()
+    harness.cache.clear()
+    harness.documents["ModusWcButton"] = {"description": "Another " + DESCRIPTION, "properties": []}
+    harness.generation = 2
+    assert harness.call()["description"] == "Another " + DESCRIPTION
+
+
+def test_no_session_always_gets_the_payload(harness):
+    harness.session = None
+    first = harness.call()
+    assert harness.call() == first
+    assert harness.deliveries.snapshot()["sessions_seen"] == 0
+
+
+def test_bytes_saved_per_session(harness):
+    full = asyncio.run(harness.handler("ModusWcButton"))
+    reference = asyncio.run(harness.handler("ModusWcButton"))
+    stats = harness.deliveries.snapshot()
+    assert stats["responses"] == {"full": 1, "reference": 1, "delta": 0}
+    assert stats["bytes_saved"] == stats["bytes_saved_per_session"] == len(full) - len(reference)
+    assert stats["sessions"][0]["bytes_saved"] == stats["bytes_saved"]
+
+    # A closed session's state goes away; its savings stay in the totals
+    harness.session = None
+    gc.collect()
+    stats = harness.deliveries.snapshot()
+    assert stats["active_sessions"] == 0 and stats["bytes_saved"] == len(full) - len(reference)
+
+
+def test_reference_speed(benchmark, harness):
+    harness.call()
+    loop = asyncio.new_event_loop()
+    try:
+        benchmark(lambda: loop.run_until_complete(harness.handler("ModusWcButton")))
+    finally:
+        loop.close()
+    assert_within_budget(benchmark, 1000)
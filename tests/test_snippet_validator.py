@@ -0,0 +1,100 @@
+import pytest
+
+from modules.kb_index import iter_code_blocks
+from perf import assert_within_budget
+
+
+def _problems(result):
+    return [(problem["kind"], problem["attribute"]) for problem in result["problems"]]
+
+
+def test_valid_react_snippet(registry):
+    code = ('<ModusWcButton color="primary" variant="outlined" disabled={busy} onButtonClick={() => save()}>\n'
+            '  <ModusWcIcon name="add" decorative={true} />\n'
+            '</ModusWcButton>\n')
+    result = registry.validate_snippet(code, "react")
+    assert result["valid"] is True
+    assert result["tags_checked"] == 2
+
+
+def test_react_problems_are_all_reported_with_positions(registry):
+    code = ('<ModusWcButton colour="primary" variant="primary" onButonClick={save}>\n'
+            '  <ModusWcIcon name="ad" />\n'
+            '</ModusWcButton>\n'
+            '<ModusWcFoo />\n')
+    result = registry.validate_snippet(code, "react")
+    assert _problems(result) == [
+        ("unknown_property", "colour"),
+        ("invalid_value", "variant"),
+        ("unknown_event", "onButonClick"),
+        ("invalid_icon", "name"),
+        ("unknown_component", None),
+    ]
+    assert [(problem["line"], problem["column"]) for problem in result["problems"]] == \
+        [(1, 16), (1, 33), (1, 51), (2, 16), (4, 2)]
+    assert "color" in result["problems"][0]["suggestions"]
+    assert result["problems"][2]["suggestions"] == ["onButtonClick"]
+    assert "add" in result["problems"][3]["suggestions"]
+
+
+def test_tags_nested_in_attribute_expressions_keep_their_position(registry):
+    code = '<ModusWcButton\n foo="1"\n icon={<ModusWcIcon\n nme="x" />}\n bar="2"\n/>'
+    result = registry.validate_snippet(code, "react")
+    positions = {problem["attribute"]: (problem["line"], problem["column"]) for problem in result["problems"]}
+    assert positions == {"foo": (2, 2), "icon": (3, 2), "bar": (5, 2), "nme": (4, 2)}
+
+
+def test_expressions_are_skipped_not_parsed(registry):
+    code = ('<ModusWcTextInput {...props} label={`Name ${"}"}`} onInputChange={(e) => { if (e) { f("/>") } }}\n'
+            '  value={value} /* } */ size="md" />')
+    assert registry.validate_snippet(code)["valid"] is True
+
+
+def test_angular_bindings(registry):
+    code = ('<modus-wc-button [disabled]="saving" [variant]="\'primary\'" (buttonClick)="save()" '
+            '(buttonClik)="save()" *ngIf="ready" #saveButton [attr.aria-label]="label" formControlName="x">'
+            '</modus-wc-button>')
+    result = registry.validate_snippet(code, "angular")
+    assert _problems(result) == [("invalid_value", "[variant]"), ("unknown_event", "(buttonClik)")]
+    assert result["problems"][1]["suggestions"] == ["(buttonClick)"]
+
+
+def test_html_attributes_are_kebab_case(registry):
+    result = registry.validate_snippet('<modus-wc-button custom-class="a" customClass="b" onclick="f()">', "html")
+    assert _problems(result) == [("unknown_property", "customClass")]
+    assert result["problems"][0]["suggestions"] == ["custom-class"]
+
+
+def test_boolean_icon_flags_are_not_icon_names(registry):
+    assert registry.validate_snippet('<ModusWcToast showIcon="false" />')["valid"] is True
+    assert registry.validate_snippet('<modus-wc-toast show-icon="true"></modus-wc-toast>', "html")["valid"] is True
+    assert _problems(registry.validate_snippet('<ModusWcAlert icon="nope_x" />')) == [("invalid_icon", "icon")]
+
+
+def test_global_attribute_declared_by_the_component_is_checked(registry):
+    assert _problems(registry.validate_snippet('<ModusWcAlert role="banner" />')) == [("invalid_value", "role")]
+    assert registry.validate_snippet('<ModusWcAlert role="status" /><ModusWcButton role="switch" />')["valid"] is True
+
+
+def test_unknown_framework(registry):
+    with pytest.raises(ValueError):
+        registry.validate_snippet("<ModusWcButton />", "vue")
+
+
+def _snippet_of(registry, lines):
+    """Knowledge base TSX examples concatenated to about `lines` lines"""
+    blocks = [block.code for _, _, block in iter_code_blocks(registry.snapshot().kb_contents["react"])
+              if block.language == "tsx"]
+    code = []
+    while len(code) < lines:
+        for block in blocks:
+            code.extend(block.split("\n"))
+    return "\n".join(code[:lines])
+
+
+def test_validate_300_line_snippet_speed(benchmark, registry):
+    code = _snippet_of(registry, 300)
+    result = benchmark(registry.validate_snippet, code, "react")
+    assert result["tags_checked"] > 5
+    # Target: cheap enough to run on every generation
+    assert_within_budget(benchmark, 5_000)
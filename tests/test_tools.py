@@ -0,0 +1,129 @@
+import json
+import asyncio
+import threading
+
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+import ModusFromMCP
+from perf import assert_within_budget
+
+
+class InProcessClient:
+    """A real MCP client session connected to the FastMCP server over in-memory streams
+
+    The session lives on an event loop in a background thread, so synchronous
+    benchmark functions can issue round trips through it.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+        self._connected = threading.Event()
+        self._session_task = asyncio.run_coroutine_threadsafe(self._run(), self.loop)
+        self._connected.wait()
+
+    async def _run(self):
+        # The session must be opened and closed in the same task
+        self._closing = asyncio.Event()
+        async with create_connected_server_and_client_session(ModusFromMCP.mcp._mcp_server) as session:
+            self.session = session
+            self._connected.set()
+            await self._closing.wait()
+
+    def call_tool(self, name, arguments=None):
+        result = asyncio.run_coroutine_threadsafe(self.session.call_tool(name, arguments or {}), self.loop).result()
+        assert not result.isError, result
+        return json.loads(result.content[0].text)
+
+    def read_resource(self, uri):
+        return asyncio.run_coroutine_threadsafe(self.session.read_resource(uri), self.loop).result()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self._closing.set)
+        self._session_task.result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+@pytest.fixture(scope="module")
+def client():
+    client = InProcessClient()
+    yield client
+    client.close()
+
+
+def test_list_tools(client):
+    tools = asyncio.run_coroutine_threadsafe(client.session.list_tools(), client.loop).result()
+    names = {tool.name for tool in tools.tools}
+    assert {"get_component_details", "get_components_details", "search_modus", "get_doc_section",
+            "find_similar_examples", "get_related_components", "validate_modus_snippet", "server_stats"} <= names
+
+
+def test_get_component_details_round_trip(client):
+    result = client.call_tool("get_component_details", {"component_name": "ModusWcButton", "fields": ["events"]})
+    assert result["success"] is True
+    assert result["component"] == "ModusWcButton"
+    assert set(result) >= {"events", "etag"}
+
+
+def test_get_related_components_with_fields_round_trip(client):
+    result = client.call_tool("get_related_components", {"component_name": "ModusWcTable", "fields": ["events"]})
+    assert result["success"] is True
+    assert result["related"] and {entry["name"] for entry in result["related"]} <= result["details"]["components"].keys()
+
+
+def test_unknown_component_is_an_error_payload(client):
+    result = client.call_tool("get_component_details", {"component_name": "ModusWcNope"})
+    assert result["success"] is False
+
+
+def test_validate_modus_snippet_round_trip(client):
+    result = client.call_tool("validate_modus_snippet", {"code": '<ModusWcIcon name="ad" />'})
+    assert result["success"] is True
+    assert result["valid"] is False
+    assert result["problems"][0]["kind"] == "invalid_icon"
+
+
+def test_icon_lists_are_limited_by_default(client):
+    result = client.call_tool("get_modus_icons_by_char", {"force_full": True})
+    assert result["icon_count"] == 50 and result["total_matches"] > 50
+    result = client.call_tool("get_modus_icons_by_char", {"contains": "arrow", "limit": 3, "force_full": True})
+    assert result["icon_count"] == 3 and result["total_matches"] > 3
+
+
+def test_if_none_match_returns_unchanged(client):
+    first = client.call_tool("get_list_of_all_modus_components")
+    second = client.call_tool("get_list_of_all_modus_components", {"if_none_match": first["etag"]})
+    assert second == {"success": True, "unchanged": True, "etag": first["etag"]}
+
+
+def test_repeated_call_in_a_session_is_a_reference(client):
+    arguments = {"component_name": "ModusWcSelect", "fields": ["properties"]}
+    first = client.call_tool("get_component_details", arguments)
+    second = client.call_tool("get_component_details", arguments)
+    assert second["already_sent"] and second["etag"] == first["etag"]
+    assert client.call_tool("get_component_details", {**arguments, "force_full": True}) == first
+    stats = client.call_tool("server_stats")["session_deliveries"]
+    assert stats["bytes_saved"] > 0 and stats["sessions"]
+
+
+def test_knowledge_base_resource(client):
+    result = client.read_resource("http://localhost:3001/resources/modus_kb")
+    assert "# ModusWcButton" in json.loads(result.contents[0].text)["content"]
+
+
+def test_get_component_details_round_trip_speed(benchmark, client):
+    benchmark(client.call_tool, "get_component_details", {"component_name": "ModusWcButton", "force_full": True})
+    assert_within_budget(benchmark, 30_000)
+
+
+def test_search_modus_round_trip_speed(benchmark, client):
+    benchmark(client.call_tool, "search_modus", {"query": "dropdown select options", "force_full": True})
+    assert_within_budget(benchmark, 30_000)
+
+
+def test_get_modus_icons_by_char_round_trip_speed(benchmark, client):
+    benchmark(client.call_tool, "get_modus_icons_by_char", {"char_prefix": "ar", "force_full": True})
+    assert_within_budget(benchmark, 30_000)